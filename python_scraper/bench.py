@@ -0,0 +1,388 @@
+# bench.py
+"""
+Scraper benchmark suite
+Runs the hot paths against hand-built listing pages in Eventbrite's markup shape
+(bench_fixtures/ - synthetic, not captured from the live site) and generated pages
+of 100 / 1k / 10k events, with an in-process Mongo stand-in for the sync stage.
+
+Usage:
+    python bench.py [--quick] [--repeat N] [--out results.json] [--compare old.json]
+    python bench.py extract [page.html ...]   # fast pattern scan vs BeautifulSoup
+
+Each stage reports p50/p95/mean latency per call, throughput (items/s at p50) and
+peak traced memory. Results are written as JSON so runs can be compared across versions.
+Fixtures use sequential fake IDs and far-future (2099) dates so they never age out
+of the upcoming filter.
+"""
+
+import os
+import sys
+import json
+import html
+import math
+import atexit
+import shutil
+import tempfile
+import time
+import logging
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import scraper
+from memory_mongo import MemoryClient
+from near_dupes import NearDuplicateIndex
+
+# The sync stage is measured offline - no detail-page fetches, and near-duplicate
+# state goes to a throwaway file instead of the scraper's .near_dupes.json
+scraper.ENRICH_ENABLED = False
+_STATE_DIR = tempfile.mkdtemp(prefix="scraper-bench-")
+atexit.register(shutil.rmtree, _STATE_DIR, ignore_errors=True)
+scraper.near_dupes = NearDuplicateIndex(os.path.join(_STATE_DIR, "near_dupes.json"))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_fixtures")
+
+# `import scraper` must stay cheap (no network, no heavy deps) - the suite fails above this
+IMPORT_BUDGET_MS = float(os.getenv("SCRAPER_IMPORT_BUDGET_MS", "150"))
+
+
+# ---------------------------------------------------------------------------
+# Inputs
+# ---------------------------------------------------------------------------
+
+def synthetic_ld_json_page(n_events, padding_kb=500):
+    """Listing page with n JSON-LD events plus filler markup"""
+    start = datetime.utcnow() + timedelta(days=2)
+    items = []
+    for i in range(n_events):
+        d = (start + timedelta(hours=i)).replace(microsecond=0)
+        items.append({
+            "@type": "Event",
+            "name": f"Synthetic Event Number {i}",
+            "startDate": d.isoformat(),
+            "endDate": (d + timedelta(hours=3)).isoformat(),
+            "url": f"https://www.eventbrite.com.au/e/synthetic-event-{i}",
+            "identifier": 100000 + i,
+            "description": "Live music and good company. " * 8,
+            "location": {"name": f"Venue {i % 40}", "address": {"streetAddress": f"{i} George St", "addressLocality": "Sydney"}},
+            "image": f"https://img.evbuc.com/{i}.jpg",
+            "keywords": "music,live,night",
+        })
+    filler = '<div class="card"><a href="/x">Link &amp; text</a><img src="a.png"></div>\n' * (padding_kb * 1024 // 80)
+    return (
+        "<html><head><title>Events</title>"
+        '<script type="text/javascript">var x = "<div>";</script>'
+        f'</head><body>{filler}<script type="application/ld+json">{json.dumps(items)}</script></body></html>'
+    )
+
+
+def synthetic_data_props_page(n_events, padding_kb=500):
+    """Listing page with n events in a React data-props attribute"""
+    start = datetime.utcnow() + timedelta(days=2)
+    events = []
+    for i in range(n_events):
+        d = (start + timedelta(hours=i)).replace(microsecond=0)
+        events.append({
+            "id": 200000 + i,
+            "name": f"Props Event Number {i} <b>&</b>",
+            "start_date": d.isoformat(),
+            "end_date": (d + timedelta(hours=2)).isoformat(),
+            "url": f"https://www.eventbrite.com.au/e/props-event-{i}",
+            "summary": "Workshop > lecture 'quoted'",
+            "venue": {"name": "Town Hall", "address": "483 George St", "city": "sydney"},
+            "image": {"url": f"https://img.evbuc.com/p{i}.jpg"},
+            "tags": ["workshop"],
+        })
+    props = html.escape(json.dumps({"events": events}), quote=True)
+    filler = '<div class="card"><span>Filler &nbsp; text</span></div>\n' * (padding_kb * 1024 // 60)
+    return f'<html><body>{filler}<div id="root" data-props="{props}"></div></body></html>'
+
+
+def synthetic_date_strings(n):
+    """Mix of the date formats seen in listing payloads (with repeats, like real pages)"""
+    start = datetime(2099, 1, 1, 18, 0)
+    formats = [
+        lambda d: d.isoformat(),
+        lambda d: d.isoformat() + "Z",
+        lambda d: d.strftime("%Y-%m-%dT%H:%M:%S+11:00"),
+        lambda d: d.strftime("%Y-%m-%d"),
+        lambda d: d.strftime("%a, %d %b %Y %I:%M %p"),
+    ]
+    return [formats[i % len(formats)](start + timedelta(hours=(i // 3) % 200)) for i in range(n)]
+
+
+def load_fixture_pages():
+    pages = []
+    if os.path.isdir(FIXTURES_DIR):
+        for name in sorted(os.listdir(FIXTURES_DIR)):
+            if name.endswith(".html"):
+                with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+                    pages.append((f"fixture {name[:-5]}", f.read()))
+    return pages
+
+
+def load_pages(paths):
+    if paths:
+        pages = []
+        for path in paths:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                pages.append((path, f.read()))
+        return pages
+    return [
+        ("synthetic ld+json 100", synthetic_ld_json_page(100)),
+        ("synthetic ld+json 1000", synthetic_ld_json_page(1000)),
+        ("synthetic data-props 100", synthetic_data_props_page(100)),
+        ("synthetic data-props 1000", synthetic_data_props_page(1000)),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values, p):
+    idx = max(0, math.ceil(p * len(sorted_values)) - 1)
+    return sorted_values[idx]
+
+
+def measure(stage, label, fn, items, repeat, setup=None):
+    """
+    Time fn(state) `repeat` times (setup() runs untimed before each call),
+    then run it once more under tracemalloc for peak memory
+    """
+    state = setup() if setup else None
+    fn(state)  # warm-up
+
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        t0 = time.perf_counter()
+        fn(state)
+        times.append(time.perf_counter() - t0)
+
+    state = setup() if setup else None
+    tracemalloc.start()
+    fn(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    times.sort()
+    p50 = percentile(times, 0.5)
+    return {
+        "stage": stage,
+        "input": label,
+        "items": items,
+        "calls": repeat,
+        "p50Ms": round(p50 * 1000, 3),
+        "p95Ms": round(percentile(times, 0.95) * 1000, 3),
+        "meanMs": round(sum(times) / len(times) * 1000, 3),
+        "throughput": round(items / p50, 1) if p50 > 0 else None,
+        "peakKb": round(peak / 1024, 1),
+    }
+
+
+def measure_import(repeat):
+    """Wall time of `import scraper` in a fresh interpreter (cold module state, warm disk cache)"""
+    code = "import time; t0 = time.perf_counter(); import scraper; print(time.perf_counter() - t0)"
+    env = dict(os.environ, MONGO_URI="mongodb://unreachable.invalid:27017")
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    times = sorted(
+        float(subprocess.check_output([sys.executable, "-c", code], cwd=cwd, env=env).decode().strip())
+        for _ in range(repeat)
+    )
+    p50 = percentile(times, 0.5)
+    return {
+        "stage": "import",
+        "input": "import scraper",
+        "items": 1,
+        "calls": repeat,
+        "p50Ms": round(p50 * 1000, 3),
+        "p95Ms": round(percentile(times, 0.95) * 1000, 3),
+        "meanMs": round(sum(times) / len(times) * 1000, 3),
+        "throughput": None,
+        "peakKb": 0,
+        "budgetMs": IMPORT_BUDGET_MS,
+    }
+
+
+def fresh_database():
+    """Point the scraper's collections at an empty in-memory database"""
+    db = MemoryClient()["bench"]
+    scraper.use_database(db)
+    scraper.ensure_indexes()
+    return db
+
+
+# ---------------------------------------------------------------------------
+# Suite
+# ---------------------------------------------------------------------------
+
+def run_suite(quick=False, repeat=None):
+    repeat = repeat or (3 if quick else 7)
+    sizes = [100, 1000] if quick else [100, 1000, 10000]
+    results = []
+
+    def report(result):
+        results.append(result)
+        print(f"{result['stage']:<18} {result['input']:<28} {result['items']:>6} "
+              f"{result['p50Ms']:>10.2f} {result['p95Ms']:>10.2f} {result['throughput'] or 0:>12.0f} {result['peakKb']:>10.0f}")
+
+    print(f"{'stage':<18} {'input':<28} {'items':>6} {'p50 ms':>10} {'p95 ms':>10} {'items/s':>12} {'peak KB':>10}")
+
+    # import scraper (side-effect free, heavy dependencies deferred)
+    report(measure_import(max(repeat, 5)))
+
+    # extract_eventbrite_api_data: hand-built fixtures + generated pages
+    pages = load_fixture_pages()
+    for n in sizes:
+        pages.append((f"synthetic ld+json {n}", synthetic_ld_json_page(n)))
+        pages.append((f"synthetic data-props {n}", synthetic_data_props_page(n)))
+
+    largest_events = []
+    for label, content in pages:
+        events = scraper.extract_eventbrite_api_data(content, "sydney")
+        if label.startswith("synthetic ld+json") and len(events) > len(largest_events):
+            largest_events = events
+        report(measure("extract", label, lambda _: scraper.extract_eventbrite_api_data(content, "sydney"),
+                       max(len(events), 1), repeat))
+
+    # Concurrent pages: in-thread parsing vs the parse process pool (needs >1 core to pay off)
+    concurrent_pages = [synthetic_ld_json_page(1000) for _ in range(8)]
+    workers = scraper.PARSE_WORKERS or 2
+    pool = scraper.ParsePool(workers=workers)
+    pool.extract(concurrent_pages[0], "sydney")  # start the workers outside the timings
+    with ThreadPoolExecutor(max_workers=len(concurrent_pages)) as threads:
+        for label, extract in (("in-thread", scraper.extract_eventbrite_api_data), (f"{workers} processes", pool.extract)):
+            report(measure("parse_concurrent", f"8 pages x 1000, {label}",
+                           lambda _, extract=extract: list(threads.map(lambda page: extract(page, "sydney"), concurrent_pages)),
+                           8000, repeat))
+    pool.close()
+
+    # parse_eventbrite_date
+    dates = synthetic_date_strings(1000)
+    report(measure("parse_date", "mixed formats 1000", lambda _: [scraper.parse_eventbrite_date(d) for d in dates],
+                   len(dates), repeat))
+    # same, with the memo cleared before every call (one page's worth of repeats only)
+    clear_date_cache = getattr(getattr(scraper, "_parse_iso_date", None), "cache_clear", None)
+    if clear_date_cache:
+        report(measure("parse_date_cold", "mixed formats 1000", lambda _: [scraper.parse_eventbrite_date(d) for d in dates],
+                       len(dates), repeat, setup=clear_date_cache))
+
+    # generate_event_hash
+    hash_inputs = [(e["title"], e["dateTime"], e["sourceUrl"]) for e in largest_events[:1000]]
+    report(measure("event_hash", f"{len(hash_inputs)} events", lambda _: [scraper.generate_event_hash(*args) for args in hash_inputs],
+                   len(hash_inputs), repeat))
+
+    # sync_to_mongo against the in-memory stand-in
+    logging.getLogger(scraper.__name__).setLevel(logging.WARNING)
+    for n in sizes:
+        events = largest_events[:n]
+        if len(events) < n:
+            continue
+
+        def first_sync_setup():
+            fresh_database()
+
+        def resync_setup(events=events):
+            fresh_database()
+            scraper.sync_to_mongo(events, "sydney")
+
+        report(measure("sync_insert", f"{n} new events", lambda _, events=events: scraper.sync_to_mongo(events, "sydney"),
+                       n, repeat, setup=first_sync_setup))
+        report(measure("sync_unchanged", f"{n} unchanged events", lambda _, events=events: scraper.sync_to_mongo(events, "sydney"),
+                       n, repeat, setup=resync_setup))
+    logging.getLogger(scraper.__name__).setLevel(logging.INFO)
+
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_path):
+    """Print p50 and throughput ratios against a previous results file"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    old = {(r["stage"], r["input"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline_path} ({baseline['meta'].get('gitRevision')})")
+    print(f"{'stage':<18} {'input':<28} {'p50 old':>10} {'p50 new':>10} {'speedup':>8}")
+    for r in results:
+        prev = old.get((r["stage"], r["input"]))
+        if not prev or not r["p50Ms"]:
+            continue
+        print(f"{r['stage']:<18} {r['input']:<28} {prev['p50Ms']:>10.2f} {r['p50Ms']:>10.2f} {prev['p50Ms'] / r['p50Ms']:>7.2f}x")
+
+
+# ---------------------------------------------------------------------------
+# Extractor comparison
+# ---------------------------------------------------------------------------
+
+def comparable(events):
+    """Event dicts without per-call timestamps"""
+    return [{k: v for k, v in e.items() if k != "lastScrapedAt"} for e in events]
+
+
+def time_call(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def bench_extract(pages, repeat=5):
+    print(f"{'page':<32} {'events':>7} {'soup ms':>10} {'fast ms':>10} {'speedup':>8}  identical")
+    for name, content in pages:
+        soup_t, soup_events = time_call(lambda: scraper.extract_eventbrite_api_data(content, "sydney", parser="soup"), repeat)
+        fast_t, fast_events = time_call(lambda: scraper.extract_eventbrite_api_data(content, "sydney", parser="fast"), repeat)
+        same = comparable(soup_events) == comparable(fast_events)
+        print(f"{name[-32:]:<32} {len(fast_events):>7} {soup_t * 1000:>10.1f} {fast_t * 1000:>10.1f} "
+              f"{soup_t / fast_t:>7.1f}x  {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "extract":
+        bench_extract(load_fixture_pages() + load_pages(sys.argv[2:]))
+        sys.exit(0)
+
+    arg_parser = argparse.ArgumentParser(description="Scraper benchmark suite")
+    arg_parser.add_argument("--quick", action="store_true", help="skip the 10k-event inputs and use fewer repeats")
+    arg_parser.add_argument("--repeat", type=int, help="timed calls per stage")
+    arg_parser.add_argument("--out", default="bench_results.json", help="where to write JSON results")
+    arg_parser.add_argument("--compare", help="previous results file to compare against")
+    args = arg_parser.parse_args()
+
+    results = run_suite(quick=args.quick, repeat=args.repeat)
+    output = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "gitRevision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults written to {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    import_ms = next(r["p50Ms"] for r in results if r["stage"] == "import")
+    if import_ms > IMPORT_BUDGET_MS:
+        print(f"\nimport scraper took {import_ms:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+        sys.exit(1)
@@ -0,0 +1,66 @@
+# detail_cache.py
+"""
+Local cache of fields enriched from event detail pages
+Keyed by sourceEventId and stamped with the listing fingerprint (content hash) the
+details were fetched for, so an event is only re-enriched after its listing changes.
+Entries older than max_age are dropped; state is one JSON file written atomically.
+"""
+
+import os
+import json
+import time
+import threading
+
+
+class DetailCache:
+    """sourceEventId -> {"fingerprint", "fields", "storedAt"}, loaded on first use"""
+
+    def __init__(self, state_path, max_age=30 * 24 * 3600, max_entries=20000):
+        self.state_path = state_path
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self._entries = None
+        self.dirty = False
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key, fingerprint):
+        """Cached fields for key if they were fetched for this fingerprint, else None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry or entry.get("fingerprint") != fingerprint:
+                return None
+            if time.time() - entry.get("storedAt", 0) > self.max_age:
+                return None
+            return entry["fields"]
+
+    def put(self, key, fingerprint, fields):
+        with self.lock:
+            self.entries[key] = {"fingerprint": fingerprint, "fields": fields, "storedAt": time.time()}
+            self.dirty = True
+
+    def save(self):
+        """Persist, dropping expired entries and the oldest beyond max_entries"""
+        with self.lock:
+            if not self.dirty:
+                return
+            cutoff = time.time() - self.max_age
+            live = sorted(
+                ((k, e) for k, e in self.entries.items() if e.get("storedAt", 0) >= cutoff),
+                key=lambda item: item[1]["storedAt"]
+            )[-self.max_entries:]
+            self._entries = dict(live)
+            tmp = f"{self.state_path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, separators=(",", ":"))
+            os.replace(tmp, self.state_path)
+            self.dirty = False
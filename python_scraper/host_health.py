@@ -0,0 +1,91 @@
+# host_health.py
+"""
+Persisted per-host circuit breaker
+Records blocks / empty results per host in a small JSON state file so later
+runs (and other cities in the same run) skip a host that is actively blocking
+us, then let a single cheap probe through once the cooldown expires.
+"""
+
+import os
+import json
+import time
+import threading
+
+CLOSED = "closed"   # host healthy - use it normally
+OPEN = "open"       # in cooldown - skip straight to the fallback
+PROBE = "probe"     # cooldown over - allow one cheap attempt
+
+
+class HostHealth:
+    """Circuit breaker state for each host, saved to state_path after every change"""
+
+    def __init__(self, state_path, failure_threshold=2, cooldown=30 * 60, max_cooldown=6 * 3600):
+        self.state_path = state_path
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.lock = threading.Lock()
+        self._hosts = None
+
+    @property
+    def hosts(self):
+        """Per-host state, read from state_path on first access"""
+        if self._hosts is None:
+            self._hosts = self._load()
+        return self._hosts
+
+    def _load(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        tmp = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.hosts, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def check(self, host):
+        """CLOSED, OPEN or PROBE for host; only one caller gets PROBE per cooldown"""
+        with self.lock:
+            state = self.hosts.get(host)
+            if not state or state.get("failures", 0) < self.failure_threshold:
+                return CLOSED
+            now = time.time()
+            if now < state.get("openUntil", 0):
+                return OPEN
+            # Hand out a single probe, then keep others on the fallback until it reports back
+            if now - state.get("probeAt", 0) < self.cooldown:
+                return OPEN
+            state["probeAt"] = now
+            self._save()
+            return PROBE
+
+    def is_open(self, host):
+        """Read-only check for secondary traffic (detail pages): True while the circuit is not closed"""
+        with self.lock:
+            state = self.hosts.get(host)
+            return bool(state) and state.get("failures", 0) >= self.failure_threshold
+
+    def record_success(self, host):
+        with self.lock:
+            if host in self.hosts:
+                del self.hosts[host]
+                self._save()
+
+    def record_failure(self, host, reason, immediate=False):
+        """
+        Count a failure; the circuit opens after failure_threshold in a row
+        (immediately for hard blocks) and each re-open doubles the cooldown
+        """
+        with self.lock:
+            state = self.hosts.setdefault(host, {"failures": 0})
+            state["failures"] = max(state["failures"] + 1, self.failure_threshold if immediate else 0)
+            state["lastReason"] = reason
+            state["lastFailureAt"] = time.time()
+            if state["failures"] >= self.failure_threshold:
+                trips = min(state["failures"] - self.failure_threshold, 16)
+                state["openUntil"] = time.time() + min(self.cooldown * 2 ** trips, self.max_cooldown)
+            self._save()
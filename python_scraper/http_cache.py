@@ -0,0 +1,136 @@
+# http_cache.py
+"""
+On-disk HTTP response cache for listing pages
+Stores validators (ETag / Last-Modified) and a body hash per URL so unchanged pages
+can be detected with a conditional request or a hash compare. Entries carry the
+caller's version and expire max_age after they were stored (a 304 does not extend
+them), so pages are fully re-parsed periodically and after extraction changes.
+Bounded by entry age and total size (oldest entries evicted first).
+"""
+
+import os
+import json
+import time
+import threading
+from hashlib import sha256
+
+
+class ResponseCache:
+    """URL-keyed response metadata stored as <sha256(url)>.json files"""
+
+    def __init__(self, cache_dir, max_bytes=50 * 1024 * 1024, max_age=24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.lock = threading.Lock()
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    @staticmethod
+    def body_hash(body):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return sha256(body).hexdigest()
+
+    def get(self, url, version=None):
+        """Cached metadata for url, or None if missing, expired or stored under another version"""
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - meta.get("storedAt", 0) > self.max_age or meta.get("version") != version:
+            self.delete(url)
+            return None
+        return meta
+
+    def conditional_headers(self, meta):
+        """If-None-Match / If-Modified-Since headers for a cached entry"""
+        headers = {}
+        if not meta:
+            return headers
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("lastModified"):
+            headers["If-Modified-Since"] = meta["lastModified"]
+        return headers
+
+    def put(self, url, response, version=None, **extra):
+        """Store a successful requests.Response's validators (plus extra metadata) and enforce the size/age bounds"""
+        self.store(self.entry(url, response, version, **extra))
+
+    def entry(self, url, response, version=None, **extra):
+        """Cache entry for a response, to store() once whatever depends on it has succeeded"""
+        meta = {
+            "url": url,
+            "version": version,
+            "etag": response.headers.get("ETag"),
+            "lastModified": response.headers.get("Last-Modified"),
+            "bodyHash": self.body_hash(response.content),
+            "storedAt": time.time(),
+        }
+        meta.update(extra)
+        return meta
+
+    def store(self, meta):
+        with self.lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._atomic_write(self._path(meta["url"]), json.dumps(meta).encode("utf-8"))
+            self.evict()
+
+    def delete(self, url):
+        try:
+            os.remove(self._path(url))
+        except OSError:
+            pass
+
+    def evict(self):
+        """Drop expired entries, then the oldest ones until under max_bytes"""
+        entries = {}
+        now = time.time()
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            key = name.split(".", 1)[0]
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entry = entries.setdefault(key, {"paths": [], "size": 0, "mtime": 0})
+            entry["paths"].append(path)
+            entry["size"] += st.st_size
+            entry["mtime"] = max(entry["mtime"], st.st_mtime)
+
+        total = 0
+        live = []
+        for entry in entries.values():
+            if now - entry["mtime"] > self.max_age:
+                self._remove(entry["paths"])
+            else:
+                total += entry["size"]
+                live.append(entry)
+
+        for entry in sorted(live, key=lambda e: e["mtime"]):
+            if total <= self.max_bytes:
+                break
+            self._remove(entry["paths"])
+            total -= entry["size"]
+
+    @staticmethod
+    def _remove(paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _atomic_write(path, data):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
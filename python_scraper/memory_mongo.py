@@ -0,0 +1,295 @@
+# memory_mongo.py
+"""
+In-process MongoDB stand-in for benchmarks and offline runs
+Implements only the subset of the pymongo API the scraper uses: find / find_one,
+bulk_write(UpdateOne), update_one / update_many, insert_one, count_documents,
+find_one_and_update and create_index (single-field equality indexes are honoured).
+"""
+
+import copy
+from itertools import count
+
+from pymongo import ReturnDocument
+
+_MISSING = object()
+
+
+def _get(doc, path):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _compare(value, op, arg):
+    if op == "$in":
+        if value is _MISSING:
+            return None in arg
+        if isinstance(value, list):
+            return any(v in arg for v in value)
+        return value in arg
+    if op == "$nin":
+        return not _compare(value, "$in", arg)
+    if op == "$ne":
+        return not _equals(value, arg)
+    if op == "$exists":
+        return (value is not _MISSING) == bool(arg)
+    if op == "$not":
+        return not _match_value(value, arg)
+    if value is _MISSING or value is None:
+        return False
+    try:
+        if op == "$lt":
+            return value < arg
+        if op == "$lte":
+            return value <= arg
+        if op == "$gt":
+            return value > arg
+        if op == "$gte":
+            return value >= arg
+    except TypeError:
+        return False
+    raise NotImplementedError(f"memory_mongo: unsupported operator {op}")
+
+
+def _equals(value, arg):
+    if arg is None:
+        return value is _MISSING or value is None
+    if isinstance(value, list) and not isinstance(arg, list):
+        return arg in value
+    return value is not _MISSING and value == arg
+
+
+def _match_value(value, cond):
+    if isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond):
+        return all(_compare(value, op, arg) for op, arg in cond.items())
+    return _equals(value, cond)
+
+
+def matches(doc, query):
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(matches(doc, q) for q in cond):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, q) for q in cond):
+                return False
+        elif not _match_value(_get(doc, key), cond):
+            return False
+    return True
+
+
+def _project(doc, projection):
+    if not projection:
+        return copy.deepcopy(doc)
+    include = {k for k, v in projection.items() if v and k != "_id"}
+    if include:
+        out = {k: copy.deepcopy(doc[k]) for k in include if k in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            out["_id"] = doc["_id"]
+        return out
+    return {k: copy.deepcopy(v) for k, v in doc.items() if projection.get(k, 1)}
+
+
+class _Cursor(list):
+    """List of results with the chainable cursor methods the scraper uses"""
+
+    def sort(self, key, direction=1):
+        present = [d for d in self if _get(d, key) is not _MISSING]
+        missing = [d for d in self if _get(d, key) is _MISSING]
+        present.sort(key=lambda d: _get(d, key), reverse=direction < 0)
+        return _Cursor(present + missing if direction > 0 else missing + present)
+
+    def limit(self, n):
+        return _Cursor(self[:n]) if n else self
+
+
+class _Result:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class MemoryCollection:
+    def __init__(self, name):
+        self.name = name
+        self.docs = {}
+        self.indexes = {}
+        self._ids = count(1)
+
+    # --- indexes ---
+    def create_index(self, keys, unique=False, **kwargs):
+        if isinstance(keys, str) and keys not in self.indexes:
+            index = self.indexes[keys] = {}
+            for _id, doc in self.docs.items():
+                self._index_add(index, _get(doc, keys), _id)
+        return keys if isinstance(keys, str) else "_".join(f"{k}_{d}" for k, d in keys)
+
+    @staticmethod
+    def _index_add(index, value, _id):
+        if value is not _MISSING and not isinstance(value, (list, dict)):
+            index.setdefault(value, set()).add(_id)
+
+    def _reindex(self, _id, before, after):
+        for field, index in self.indexes.items():
+            old = _get(before, field) if before is not None else _MISSING
+            new = _get(after, field) if after is not None else _MISSING
+            if old == new:
+                continue
+            if old is not _MISSING and not isinstance(old, (list, dict)) and old in index:
+                index[old].discard(_id)
+            if after is not None:
+                self._index_add(index, new, _id)
+
+    def _candidates(self, query):
+        for field, index in self.indexes.items():
+            cond = query.get(field, _MISSING)
+            if cond is _MISSING or cond is None:
+                continue
+            if isinstance(cond, dict):
+                if set(cond) == {"$in"}:
+                    ids = set()
+                    for v in cond["$in"]:
+                        ids |= index.get(v, set())
+                    return ids
+                continue
+            return set(index.get(cond, ()))
+        return self.docs.keys()
+
+    def _iter_matching(self, query):
+        for _id in list(self._candidates(query or {})):
+            doc = self.docs.get(_id)
+            if doc is not None and matches(doc, query or {}):
+                yield doc
+
+    # --- reads ---
+    def find(self, query=None, projection=None, **kwargs):
+        return _Cursor(_project(doc, projection) for doc in self._iter_matching(query))
+
+    def find_one(self, query=None, projection=None, **kwargs):
+        for doc in self._iter_matching(query):
+            return _project(doc, projection)
+        return None
+
+    def count_documents(self, query):
+        return sum(1 for _ in self._iter_matching(query))
+
+    def distinct(self, key, query=None):
+        values = []
+        for doc in self._iter_matching(query):
+            v = _get(doc, key)
+            if v is not _MISSING and v not in values:
+                values.append(v)
+        return values
+
+    # --- writes ---
+    def insert_one(self, doc):
+        doc = copy.deepcopy(doc)
+        doc.setdefault("_id", next(self._ids))
+        self.docs[doc["_id"]] = doc
+        self._reindex(doc["_id"], None, doc)
+        return _Result(inserted_id=doc["_id"])
+
+    def insert_many(self, docs, ordered=True):
+        return _Result(inserted_ids=[self.insert_one(d).inserted_id for d in docs])
+
+    @staticmethod
+    def _apply(doc, update, inserting):
+        for op, fields in update.items():
+            if op == "$setOnInsert" and not inserting:
+                continue
+            for path, value in fields.items():
+                parts = path.split(".")
+                target = doc
+                for part in parts[:-1]:
+                    target = target.setdefault(part, {})
+                if op in ("$set", "$setOnInsert"):
+                    target[parts[-1]] = copy.deepcopy(value)
+                elif op == "$inc":
+                    target[parts[-1]] = target.get(parts[-1], 0) + value
+                elif op == "$unset":
+                    target.pop(parts[-1], None)
+                elif op == "$max":
+                    if parts[-1] not in target or target[parts[-1]] < value:
+                        target[parts[-1]] = value
+                elif op == "$addToSet":
+                    items = target.setdefault(parts[-1], [])
+                    for v in (value["$each"] if isinstance(value, dict) and "$each" in value else [value]):
+                        if v not in items:
+                            items.append(v)
+                else:
+                    raise NotImplementedError(f"memory_mongo: unsupported update {op}")
+
+    def _update(self, query, update, upsert, many):
+        matched = modified = 0
+        for doc in list(self._iter_matching(query)):
+            before = copy.deepcopy(doc)
+            self._apply(doc, update, inserting=False)
+            matched += 1
+            if doc != before:
+                modified += 1
+                self._reindex(doc["_id"], before, doc)
+            if not many:
+                break
+        upserted_id = None
+        if not matched and upsert:
+            doc = {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+            self._apply(doc, update, inserting=True)
+            upserted_id = self.insert_one(doc).inserted_id
+        return _Result(matched_count=matched, modified_count=modified, upserted_id=upserted_id)
+
+    def update_one(self, query, update, upsert=False):
+        return self._update(query, update, upsert, many=False)
+
+    def update_many(self, query, update, upsert=False):
+        return self._update(query, update, upsert, many=True)
+
+    def bulk_write(self, requests, ordered=True):
+        matched = modified = upserted = 0
+        for req in requests:
+            result = self._update(req._filter, req._doc, req._upsert, many=type(req).__name__ == "UpdateMany")
+            matched += result.matched_count
+            modified += result.modified_count
+            upserted += result.upserted_id is not None
+        return _Result(matched_count=matched, modified_count=modified, upserted_count=upserted)
+
+    def find_one_and_update(self, query, update, upsert=False, return_document=ReturnDocument.BEFORE, projection=None):
+        existing = self.find_one(query)
+        result = self._update(query, update, upsert, many=False)
+        if return_document == ReturnDocument.AFTER:
+            _id = existing["_id"] if existing else result.upserted_id
+            return _project(self.docs[_id], projection) if _id in self.docs else None
+        return existing
+
+    def delete_many(self, query):
+        ids = [doc["_id"] for doc in self._iter_matching(query)]
+        for _id in ids:
+            self._reindex(_id, self.docs.pop(_id), None)
+        return _Result(deleted_count=len(ids))
+
+
+class MemoryDatabase:
+    def __init__(self, name):
+        self.name = name
+        self.collections = {}
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = MemoryCollection(name)
+        return self.collections[name]
+
+
+class MemoryClient:
+    """Drop-in for pymongo.MongoClient (arguments are ignored)"""
+
+    def __init__(self, *args, **kwargs):
+        self.databases = {}
+
+    def __getitem__(self, name):
+        if name not in self.databases:
+            self.databases[name] = MemoryDatabase(name)
+        return self.databases[name]
+
+    def close(self):
+        pass
@@ -0,0 +1,176 @@
+# near_dupes.py
+"""
+Near-duplicate event detection with MinHash + locality-sensitive hashing
+Each event's normalized title/venue text is shingled into character 4-grams and
+reduced to a MinHash signature (one SHAKE-128 digest per shingle supplies all
+num_perm hash values). Signatures are split into bands and bucketed by
+scope (city) and event day, so finding candidates is a few dict lookups per event (linear per run)
+instead of comparing every pair. State is persisted to a JSON file between runs.
+"""
+
+import os
+import re
+import json
+import struct
+import hashlib
+import threading
+from datetime import date, timedelta
+
+_SHINGLE = 4
+_STATE_VERSION = 2  # bump when the entry / bucket layout changes
+_NUMBER_RE = re.compile(r"\d+")
+
+
+def shingles(text):
+    text = " ".join(text.split())
+    if len(text) <= _SHINGLE:
+        return {text}
+    return {text[i:i + _SHINGLE] for i in range(len(text) - _SHINGLE + 1)}
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of event signatures keyed by eventHash
+    link() returns the canonical eventHash an event duplicates, or None.
+    Candidates must share the scope (city) and carry the same numbers ("Night 1" vs
+    "Night 2" are distinct). A candidate with the same listing key (source event id)
+    is an older version of this listing, not a duplicate of it.
+    """
+
+    def __init__(self, state_path, num_perm=32, bands=8, threshold=0.7, retention_days=2):
+        assert num_perm % bands == 0
+        self.state_path = state_path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.retention_days = retention_days
+        self._unpack = struct.Struct(f"<{num_perm}I").unpack
+        self.lock = threading.Lock()
+        self.entries = {}   # eventHash -> {"sig", "day": "YYYY-MM-DD", "scope", "key", "numbers", "canonical": hash|None}
+        self.buckets = {}   # (scope, day, band, band-hash) -> set(eventHash)
+        self.dirty = False
+        self.loaded = False
+
+    # --- signatures ---
+    def signature(self, text):
+        rows = [self._unpack(hashlib.shake_128(s.encode("utf-8")).digest(4 * self.num_perm)) for s in shingles(text)]
+        return [min(column) for column in zip(*rows)]
+
+    def _band_keys(self, sig, day, scope):
+        return [(scope, day, i, hash(tuple(sig[i * self.rows:(i + 1) * self.rows]))) for i in range(self.bands)]
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+    # --- index maintenance ---
+    def _add(self, event_hash, entry):
+        self.entries[event_hash] = entry
+        for key in self._band_keys(entry["sig"], entry["day"], entry["scope"]):
+            self.buckets.setdefault(key, set()).add(event_hash)
+
+    def _remove(self, event_hash):
+        entry = self.entries.pop(event_hash, None)
+        if not entry:
+            return
+        for key in self._band_keys(entry["sig"], entry["day"], entry["scope"]):
+            bucket = self.buckets.get(key)
+            if bucket:
+                bucket.discard(event_hash)
+                if not bucket:
+                    del self.buckets[key]
+
+    def link(self, event_hash, text, day, scope="", key=None):
+        """
+        Index an event (text = normalized title + venue, day = date of the event,
+        scope = normalized city, key = listing id) and return the canonical eventHash
+        it duplicates, or None if it is canonical
+        """
+        sig = self.signature(text)
+        day_key = day.isoformat()
+        with self.lock:
+            self._load()
+            previous = self.entries.get(event_hash)
+            if previous and previous["sig"] == sig and previous["day"] == day_key and previous["scope"] == scope:
+                return previous["canonical"]
+
+            numbers = _NUMBER_RE.findall(text)
+            best, best_score = None, self.threshold
+            for d in (day - timedelta(days=1), day, day + timedelta(days=1)):
+                for band in self._band_keys(sig, d.isoformat(), scope):
+                    for candidate in self.buckets.get(band, ()):
+                        entry = self.entries[candidate]
+                        if candidate == event_hash or entry.get("numbers", []) != numbers:
+                            continue
+                        if key and entry.get("key") == key:
+                            continue
+                        score = self.similarity(sig, self.entries[candidate]["sig"])
+                        if score >= best_score:
+                            best, best_score = candidate, score
+
+            canonical = None
+            if best is not None:
+                canonical = self.entries[best]["canonical"] or best
+                if canonical == event_hash or (key and self.entries.get(canonical, {}).get("key") == key):
+                    canonical = None
+
+            self._remove(event_hash)
+            self._add(event_hash, {"sig": sig, "day": day_key, "scope": scope, "key": key, "numbers": numbers,
+                                    "canonical": canonical})
+            self.dirty = True
+            return canonical
+
+    def release(self, event_hashes, repointed):
+        """
+        Drop events that went inactive and apply re-pointed canonicals ({eventHash:
+        canonical|None}); any other entry still linked to a dropped event becomes
+        canonical itself, and one linked to a re-pointed canonical follows it
+        """
+        gone = set(event_hashes)
+        with self.lock:
+            self._load()
+            for event_hash in gone:
+                self._remove(event_hash)
+            for event_hash, entry in self.entries.items():
+                if event_hash in repointed:
+                    entry["canonical"] = repointed[event_hash]
+                elif entry["canonical"] in gone:
+                    entry["canonical"] = None
+                elif repointed.get(entry["canonical"]):
+                    entry["canonical"] = repointed[entry["canonical"]]
+            self.dirty = True
+
+    # --- persistence ---
+    def _load(self):
+        """Read the saved index the first time it is needed"""
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (state.get("version") != _STATE_VERSION or state.get("numPerm") != self.num_perm
+                or state.get("bands") != self.bands):
+            return  # incompatible parameters - start fresh
+        cutoff = (date.today() - timedelta(days=self.retention_days)).isoformat()
+        for event_hash, entry in state.get("entries", {}).items():
+            if entry["day"] >= cutoff:
+                self._add(event_hash, entry)
+
+    def save(self):
+        """Persist the index (past days beyond retention are dropped)"""
+        with self.lock:
+            if not self.dirty:
+                return
+            cutoff = (date.today() - timedelta(days=self.retention_days)).isoformat()
+            for event_hash in [h for h, e in self.entries.items() if e["day"] < cutoff]:
+                self._remove(event_hash)
+            state = {"version": _STATE_VERSION, "numPerm": self.num_perm, "bands": self.bands, "entries": self.entries}
+            tmp = f"{self.state_path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp, self.state_path)
+            self.dirty = False
@@ -0,0 +1,183 @@
+# run_metrics.py
+"""
+Per-run stage timings and Prometheus export
+A RunMetrics object is created for each city run and passed down the pipeline;
+stages (fetch, parse, date parsing, hashing, Mongo prefetch / bulk_write, inactive
+sweep, Playwright launch / scroll) accumulate call count, total and max duration.
+Finished runs are folded into a process-wide registry rendered in the Prometheus
+text format, written to a file (node_exporter textfile collector) or served over HTTP.
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class RunMetrics:
+    """Stage timings and counters for one scrape run (thread-safe)"""
+
+    def __init__(self, city, source="Eventbrite"):
+        self.city = city
+        self.source = source
+        self.started_at = datetime.utcnow()
+        self._t0 = time.perf_counter()
+        self.duration = None
+        self.lock = threading.Lock()
+        self.stages = {}    # name -> {"count", "seconds", "max"}
+        self.counters = {}  # name -> number
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as one call of stage `name`"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - t0)
+
+    def add_time(self, name, seconds, calls=1):
+        """Record `calls` calls of a stage that took `seconds` in total (for timings summed in a loop)"""
+        with self.lock:
+            stage = self.stages.setdefault(name, {"count": 0, "seconds": 0.0, "max": 0.0})
+            stage["count"] += calls
+            stage["seconds"] += seconds
+            stage["max"] = max(stage["max"], seconds / calls if calls else seconds)
+
+    def add(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def finish(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._t0
+        return self
+
+    def to_doc(self):
+        """Timing fields stored on the scrapeLogs document"""
+        self.finish()
+        with self.lock:
+            return {
+                "durationMs": round(self.duration * 1000, 1),
+                "bytesDownloaded": self.counters.get("bytesDownloaded", 0),
+                "eventsExtracted": self.counters.get("eventsExtracted", 0),
+                "timings": {
+                    name: {
+                        "count": s["count"],
+                        "totalMs": round(s["seconds"] * 1000, 2),
+                        "maxMs": round(s["max"] * 1000, 2),
+                    }
+                    for name, s in self.stages.items()
+                },
+            }
+
+
+class _NullMetrics:
+    """Stand-in when a caller does not track a run; every method is a no-op"""
+
+    @contextmanager
+    def stage(self, name):
+        yield
+
+    def add_time(self, name, seconds, calls=1):
+        pass
+
+    def add(self, name, value=1):
+        pass
+
+
+NULL_METRICS = _NullMetrics()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class MetricsRegistry:
+    """Cumulative counters plus last-run gauges per city, in Prometheus text format"""
+
+    HELP = {
+        "scraper_runs_total": ("counter", "Scrape runs by outcome"),
+        "scraper_stage_seconds_total": ("counter", "Time spent in each pipeline stage"),
+        "scraper_stage_calls_total": ("counter", "Calls of each pipeline stage"),
+        "scraper_bytes_downloaded_total": ("counter", "Listing page bytes downloaded"),
+        "scraper_events_extracted_total": ("counter", "Events extracted from listing pages"),
+        "scraper_last_run_duration_seconds": ("gauge", "Wall time of the most recent run"),
+        "scraper_last_run_stage_seconds": ("gauge", "Time per stage in the most recent run"),
+        "scraper_last_run_timestamp_seconds": ("gauge", "Unix time the most recent run finished"),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}  # (metric, labels) -> value
+
+    def _inc(self, metric, labels, value):
+        self.values[(metric, labels)] = self.values.get((metric, labels), 0) + value
+
+    def record(self, metrics, status):
+        """Fold a finished RunMetrics into the registry"""
+        metrics.finish()
+        city = metrics.city.title()
+        with self.lock:
+            self._inc("scraper_runs_total", _labels(city=city, status=status), 1)
+            self._inc("scraper_bytes_downloaded_total", _labels(city=city), metrics.counters.get("bytesDownloaded", 0))
+            self._inc("scraper_events_extracted_total", _labels(city=city), metrics.counters.get("eventsExtracted", 0))
+            self.values[("scraper_last_run_duration_seconds", _labels(city=city))] = metrics.duration
+            self.values[("scraper_last_run_timestamp_seconds", _labels(city=city))] = time.time()
+            for key in [k for k in self.values if k[0] == "scraper_last_run_stage_seconds" and f'city="{_escape(city)}"' in k[1]]:
+                del self.values[key]
+            for name, stage in metrics.stages.items():
+                labels = _labels(city=city, stage=name)
+                self._inc("scraper_stage_seconds_total", labels, stage["seconds"])
+                self._inc("scraper_stage_calls_total", labels, stage["count"])
+                self.values[("scraper_last_run_stage_seconds", labels)] = stage["seconds"]
+
+    def render(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        lines = []
+        for metric, (kind, help_text) in self.HELP.items():
+            samples = [(labels, value) for (name, labels), value in items if name == metric]
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.extend(f"{metric}{labels} {value:.6g}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Atomically write the exposition to path (textfile collector friendly)"""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve /metrics on a background thread; returns the server (call shutdown() to stop)"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
@@ -15,78 +15,596 @@ import sys
 import re
 import json
 import time
+import html
 import logging
-from datetime import datetime, timedelta
-from hashlib import sha256
-from urllib.parse import urlparse, parse_qs
-import requests
-from bs4 import BeautifulSoup
-from pymongo import MongoClient, UpdateOne
-from pymongo.errors import DuplicateKeyError
-from dotenv import load_dotenv
-from dateutil import parser as date_parser
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)-8s | %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-logger = logging.getLogger(__name__)
+import signal
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain, islice
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256, blake2b
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from http_cache import ResponseCache
+from host_health import HostHealth, OPEN, PROBE
+from near_dupes import NearDuplicateIndex
+from detail_cache import DetailCache
+from run_metrics import RunMetrics, MetricsRegistry, NULL_METRICS
 
-load_dotenv()
+# Importing this module has no side effects: requests, bs4, pymongo, dateutil and
+# playwright are imported on the paths that use them, and Mongo connects on first use.
+# When run as a script, .env is loaded before the settings below are read.
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
 
-# MongoDB setup
+logger = logging.getLogger(__name__)
+
+# MongoDB setup (lazy - see get_db)
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DB_NAME = os.getenv("MONGO_DB", "events_db")
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
-events_col = db["events"]
-scrape_logs_col = db["scrapeLogs"]
+_db = None
+_db_lock = threading.Lock()
+
+def get_db():
+    """Database handle, connecting on first call"""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                from pymongo import MongoClient
+                _db = MongoClient(MONGO_URI)[DB_NAME]
+    return _db
+
+def use_database(database):
+    """Point the scraper at an existing database handle (tests, benchmarks, offline runs)"""
+    global _db
+    _db = database
+
+def events_col():
+    return get_db()["events"]
+
+def scrape_logs_col():
+    return get_db()["scrapeLogs"]
+
+def counters_col():
+    return get_db()["counters"]
+
+def deltas_col():
+    return get_db()["deltas"]
+
+# Per-run change feed (added / updated / inactivated eventHashes) for downstream caches
+DELTAS_ENABLED = os.getenv("SCRAPER_DELTAS", "1") == "1"
+DELTA_FILE = os.getenv("SCRAPER_DELTA_FILE")  # optional append-only JSONL copy of the feed
+DELTA_RETENTION_DAYS = float(os.getenv("SCRAPER_DELTA_RETENTION_DAYS", "14"))
+
+# Bump when EVENT_INDEXES / DELTA_INDEXES change so ensure_indexes() runs again on the next deploy
+INDEX_VERSION = 2
+EVENT_INDEXES = [
+    ("eventHash", {"unique": True}),
+    ("dateTime", {}),
+    ("status", {}),
+    ("city", {}),
+    ([("sourceName", 1), ("city", 1), ("lastSeenRun", 1)], {}),
+    ([("cityKey", 1), ("status", 1), ("dateTime", 1)], {}),
+    ("searchTokens", {}),
+]
+DELTA_INDEXES = [
+    ("seq", {"unique": True}),
+    ([("cityKey", 1), ("seq", 1)], {}),
+    ("createdAt", {"expireAfterSeconds": int(DELTA_RETENTION_DAYS * 24 * 3600)}),
+]
+
+def ensure_indexes(force=False):
+    """
+    Create the events and deltas indexes once per INDEX_VERSION (idempotent), and
+    backfill the search fields those indexes serve on events stored before them
+    A marker in the counters collection makes repeat calls a single find_one
+    """
+    marker = counters_col().find_one({"_id": "eventIndexes"})
+    if marker and marker.get("version", 0) >= INDEX_VERSION and not force:
+        return False
+    
+    for keys, options in EVENT_INDEXES:
+        events_col().create_index(keys, background=True, **options)
+    for keys, options in DELTA_INDEXES:
+        deltas_col().create_index(keys, background=True, **options)
+    logger.info(f"🗂️ Event indexes provisioned (version {INDEX_VERSION})")
+    logger.info(f"🔎 Backfilled cityKey / searchTokens on {backfill_search_fields()} events")
+    counters_col().update_one({"_id": "eventIndexes"}, {"$set": {"version": INDEX_VERSION}}, upsert=True)
+    return True
+
+# On-disk response cache for listing pages (conditional requests)
+HTTP_CACHE_ENABLED = os.getenv("SCRAPER_HTTP_CACHE", "1") == "1"
+response_cache = ResponseCache(
+    os.getenv("SCRAPER_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache")),
+    max_bytes=int(os.getenv("SCRAPER_CACHE_MAX_MB", "50")) * 1024 * 1024,
+    max_age=float(os.getenv("SCRAPER_CACHE_MAX_AGE_HOURS", "24")) * 3600
+)
+
+# Circuit breaker for the requests path (blocks / empty results per host)
+host_health = HostHealth(
+    os.getenv("SCRAPER_HEALTH_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".host_health.json")),
+    failure_threshold=int(os.getenv("SCRAPER_HEALTH_THRESHOLD", "2")),
+    cooldown=float(os.getenv("SCRAPER_HEALTH_COOLDOWN_MIN", "30")) * 60
+)
+
+# Near-duplicate linking (MinHash/LSH over title + venue, bucketed by day)
+NEAR_DUPES_ENABLED = os.getenv("SCRAPER_NEAR_DUPES", "1") == "1"
+near_dupes = NearDuplicateIndex(
+    os.getenv("SCRAPER_DEDUPE_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".near_dupes.json")),
+    threshold=float(os.getenv("SCRAPER_DEDUPE_THRESHOLD", "0.7"))
+)
+
+# Detail-page enrichment (full description, category, tags) for new / changed events
+ENRICH_ENABLED = os.getenv("SCRAPER_ENRICH", "1") == "1"
+ENRICH_WORKERS = int(os.getenv("SCRAPER_ENRICH_WORKERS", "4"))
+ENRICH_MAX_PER_RUN = int(os.getenv("SCRAPER_ENRICH_MAX", "50"))  # detail page fetches per city run
+detail_cache = DetailCache(
+    os.getenv("SCRAPER_DETAIL_CACHE_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".detail_cache.json")),
+    max_age=float(os.getenv("SCRAPER_DETAIL_CACHE_DAYS", "30")) * 24 * 3600
+)
 
-# Ensure indexes for performance
-events_col.create_index("eventHash", unique=True, background=True)
-events_col.create_index("dateTime", background=True)
-events_col.create_index("status", background=True)
-events_col.create_index("city", background=True)
+class UnchangedPage:
+    """Batch for a listing page whose cached copy is still current (parse skipped)"""
+    __slots__ = ("url", "event_hashes")
+
+    def __init__(self, url, event_hashes):
+        self.url = url
+        self.event_hashes = event_hashes
+
+    def __len__(self):
+        return len(self.event_hashes)
+
+class ListingPage(list):
+    """
+    Events extracted from a fetched listing page, plus the response-cache entry to
+    store once they are written (a page is never cached as unchanged before its sync succeeds)
+    """
+
+    def __init__(self, events, cache_entry=None):
+        super().__init__(events)
+        self.cache_entry = cache_entry
+
+# Stage timings: each run's are stored on its scrapeLogs entry and folded into a
+# Prometheus registry, written to SCRAPER_METRICS_FILE after every run and served
+# on 127.0.0.1:SCRAPER_METRICS_PORT/metrics in daemon mode
+METRICS_FILE = os.getenv("SCRAPER_METRICS_FILE")
+METRICS_PORT = int(os.getenv("SCRAPER_METRICS_PORT", "0"))
+metrics_registry = MetricsRegistry()
+
+# Pagination for the requests path
+MAX_PAGES = int(os.getenv("SCRAPER_MAX_PAGES", "5"))
+PAGE_WORKERS = int(os.getenv("SCRAPER_PAGE_WORKERS", "3"))
+
+# Concurrency / politeness settings for multi-city runs
+MAX_WORKERS = int(os.getenv("SCRAPER_WORKERS", "5"))
+HOST_RATE = float(os.getenv("SCRAPER_HOST_RATE", "1.0"))    # requests per second per host
+HOST_BURST = int(os.getenv("SCRAPER_HOST_BURST", "2"))
+
+# Max eventHash values per $in prefetch query
+PREFETCH_CHUNK = int(os.getenv("SCRAPER_PREFETCH_CHUNK", "500"))
+
+# Refresh lastScrapedAt on events whose content did not change (one update_many per chunk)
+TOUCH_UNCHANGED = os.getenv("SCRAPER_TOUCH_UNCHANGED", "1") == "1"
+
+# Events are diffed and written in chunks of this size, so memory stays flat however large the scrape
+WRITE_BATCH = int(os.getenv("SCRAPER_WRITE_BATCH", "200"))
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+_host_buckets = {}
+_host_buckets_lock = threading.Lock()
+
+def throttle(url):
+    """Block until the shared per-host rate limiter allows a request to url"""
+    host = urlparse(url).netloc
+    with _host_buckets_lock:
+        bucket = _host_buckets.get(host)
+        if bucket is None:
+            bucket = _host_buckets[host] = TokenBucket(HOST_RATE, HOST_BURST)
+    bucket.acquire()
+
+def build_source_url(city):
+    """Listing URL for a city; SOURCE_URL may contain a {city} placeholder"""
+    city_slug = city.lower().replace(" ", "-")
+    template = os.getenv("SOURCE_URL")
+    if not template:
+        return f"https://www.eventbrite.com/d/australia--{city_slug}/events/"
+    return template.replace("{city}", city_slug)
+
+def check_source_url(cities):
+    """Raise ValueError if a fixed SOURCE_URL (no {city} placeholder) would be scraped for several cities"""
+    template = os.getenv("SOURCE_URL")
+    if template and "{city}" not in template and len({c.lower() for c in cities}) > 1:
+        raise ValueError(
+            f"SOURCE_URL has no {{city}} placeholder, so every city would scrape {template} - "
+            "use e.g. https://www.eventbrite.com/d/australia--{city}/events/ or unset it"
+        )
 
 def generate_event_hash(title, date_time, source_url):
     """Generate consistent hash for event deduplication"""
     raw = f"{title.strip().lower()}|{date_time.isoformat()}|{urlparse(source_url).path}"
     return sha256(raw.encode("utf-8")).hexdigest()
 
-def parse_eventbrite_date(date_str):
-    """Robust date parsing for Eventbrite's various date formats"""
-    if not date_str:
-        return datetime.utcnow() + timedelta(days=7)
+# Bump when derived fields written by sync change, so every event is rewritten once
+CONTENT_HASH_VERSION = "2"
+# Bump when extraction or the stored event fields change: cached listing pages from an
+# older version are re-parsed instead of being skipped as unchanged
+EXTRACTOR_VERSION = "1"
+LISTING_CACHE_VERSION = f"{EXTRACTOR_VERSION}.{CONTENT_HASH_VERSION}"
+
+def generate_content_hash(event):
+    """Digest of the user-visible content; changes whenever the stored event would"""
+    parts = [
+        CONTENT_HASH_VERSION,
+        event["title"],
+        event["shortSummary"],
+        event["description"],
+        event["venueName"],
+        event["venueAddress"],
+        event["city"],
+        to_utc_naive(event["dateTime"]).isoformat(),
+        to_utc_naive(event["endDateTime"]).isoformat() if event.get("endDateTime") else "",
+        event["imageUrl"],
+        event["sourceUrl"],
+        event["sourceEventId"],
+        ",".join(map(str, event["category"] or [])),
+        ",".join(map(str, event["tags"] or [])),
+    ]
+    return sha256("\x1f".join("" if p is None else str(p) for p in parts).encode("utf-8")).hexdigest()
+
+# Fields whose changes are reported in the delta feed (per-field digests stored as fieldHashes)
+DELTA_FIELDS = (
+    "title", "shortSummary", "description", "dateTime", "endDateTime", "venueName",
+    "venueAddress", "city", "imageUrl", "sourceUrl", "category", "tags",
+)
+
+def _field_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return to_utc_naive(value).isoformat()
+    if isinstance(value, (list, tuple)):
+        return "\x1f".join(map(str, value))
+    return str(value)
+
+def field_digests(event):
+    """{field: short digest} over DELTA_FIELDS, diffed against the stored fieldHashes"""
+    return {f: blake2b(_field_text(event.get(f)).encode("utf-8"), digest_size=4).hexdigest() for f in DELTA_FIELDS}
+
+def changed_fields(existing, digests, status, canonical):
+    """Names of the fields a write changes relative to the stored doc (all of them if it predates fieldHashes)"""
+    stored = existing.get("fieldHashes")
+    fields = [f for f in DELTA_FIELDS if not stored or stored.get(f) != digests[f]]
+    if existing.get("status") != status:
+        fields.append("status")
+    if existing.get("canonicalHash") != canonical:
+        fields.append("canonicalHash")
+    return fields
+
+# Search token prefixes (keep in sync with server/utils/searchTokens.js)
+MIN_TOKEN_PREFIX = 2
+MAX_TOKEN_PREFIX = 15
+MAX_SEARCH_TOKENS = 300
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+def normalize_text(text):
+    """Lowercase and strip accents ("Café" -> "cafe")"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+def city_key(city):
+    """Normalized city used for exact, index-backed city filters"""
+    return " ".join(normalize_text(city).split())
+
+def build_search_tokens(event):
+    """Deduplicated word prefixes from title, venue and summary for $all keyword lookups"""
+    text = " ".join(event.get(f) or "" for f in ("title", "venueName", "shortSummary"))
+    tokens = {}
+    for word in _WORD_RE.findall(normalize_text(text)):
+        for end in range(MIN_TOKEN_PREFIX, min(len(word), MAX_TOKEN_PREFIX) + 1):
+            tokens[word[:end]] = None
+            if len(tokens) >= MAX_SEARCH_TOKENS:
+                return list(tokens)
+    return list(tokens)
+
+def backfill_search_fields(chunk_size=PREFETCH_CHUNK):
+    """
+    Set cityKey / searchTokens on events that were stored without them (written before
+    they existed, or through a path that skipped them); returns the number updated
+    """
+    from pymongo import UpdateOne
     
-    try:
-        # Try ISO format first
-        return date_parser.isoparse(date_str)
-    except:
-        pass
+    updated = 0
+    ops = []
+    missing = {"$or": [{"cityKey": {"$exists": False}}, {"searchTokens": {"$exists": False}}]}
+    for doc in events_col().find(missing, {"_id": 1, "city": 1, "title": 1, "venueName": 1, "shortSummary": 1}):
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+            "cityKey": city_key(doc.get("city")),
+            "searchTokens": build_search_tokens(doc),
+        }}))
+        if len(ops) >= chunk_size:
+            updated += events_col().bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        updated += events_col().bulk_write(ops, ordered=False).modified_count
+    return updated
+
+def to_utc_naive(dt):
+    """Normalize a datetime to naive UTC (how pymongo returns stored dates)"""
+    if dt is not None and dt.tzinfo is not None:
+        return dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+# Common ISO-8601 shapes, parsed with datetime.fromisoformat instead of dateutil
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(?:Z|[+-]\d{2}:?\d{2})?)?")
+DATE_CACHE_SIZE = int(os.getenv("SCRAPER_DATE_CACHE_SIZE", "4096"))
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_iso_date(date_str):
+    """Naive-UTC datetime for an ISO date string, or None (memoized - listing pages repeat dates)"""
+    if _ISO_DATE_RE.fullmatch(date_str):
+        try:
+            return to_utc_naive(datetime.fromisoformat(date_str.replace("Z", "+00:00")))
+        except ValueError:
+            pass
+    
+    from dateutil import parser as date_parser
     
     try:
-        # Try human-readable formats
-        return date_parser.parse(date_str, fuzzy=True)
-    except:
-        pass
+        # Other ISO variants
+        return to_utc_naive(date_parser.isoparse(date_str))
+    except (ValueError, OverflowError):
+        return None
+
+def parse_eventbrite_date(date_str):
+    """
+    Robust date parsing for Eventbrite's various date formats
+    Always returns naive UTC, so offsets like "Z" / "+11:00" compare with utcnow()
+    """
+    if isinstance(date_str, datetime):
+        return to_utc_naive(date_str)
+    if date_str and isinstance(date_str, str):
+        parsed = _parse_iso_date(date_str)
+        if parsed is not None:
+            return parsed
+        
+        from dateutil import parser as date_parser
+        
+        try:
+            # Human-readable formats (not cached - partial dates like "Friday 7:00 PM" resolve against today)
+            return to_utc_naive(date_parser.parse(date_str, fuzzy=True))
+        except (ValueError, OverflowError):
+            pass
     
-    # Fallback to 7 days from now
+    # Fallback to 7 days from now (not cached - depends on the current time)
     return datetime.utcnow() + timedelta(days=7)
 
-def extract_eventbrite_api_data(html_content, city):
+# Events starting earlier than this before now are skipped (except very recent ones)
+PAST_EVENT_GRACE = timedelta(hours=6)
+
+# Field order of EventRecord (and of the compact tuples parse workers send back)
+EVENT_FIELDS = (
+    "title", "shortSummary", "description", "dateTime", "endDateTime", "venueName", "venueAddress",
+    "city", "imageUrl", "sourceName", "sourceUrl", "sourceEventId", "category", "tags", "status",
+    "lastScrapedAt", "eventHash",
+)
+_EVENT_FIELD_SET = frozenset(EVENT_FIELDS)
+
+class EventRecord:
+    """
+    One scraped event as a slotted record (no per-instance dict)
+    Supports the mapping reads/writes the sync code uses: event["title"], event.get(), items()
+    """
+    __slots__ = EVENT_FIELDS
+
+    def __init__(self, title, shortSummary, description, dateTime, endDateTime, venueName, venueAddress,
+                 city, imageUrl, sourceName, sourceUrl, sourceEventId, category, tags, status="new",
+                 lastScrapedAt=None, eventHash=None):
+        self.title = title
+        self.shortSummary = shortSummary
+        self.description = description
+        self.dateTime = dateTime
+        self.endDateTime = endDateTime
+        self.venueName = venueName
+        self.venueAddress = venueAddress
+        self.city = city
+        self.imageUrl = imageUrl
+        self.sourceName = sourceName
+        self.sourceUrl = sourceUrl
+        self.sourceEventId = sourceEventId
+        self.category = category
+        self.tags = tags
+        self.status = status
+        self.lastScrapedAt = lastScrapedAt
+        self.eventHash = eventHash
+
+    def __getitem__(self, key):
+        if key not in _EVENT_FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in _EVENT_FIELD_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in _EVENT_FIELD_SET
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in _EVENT_FIELD_SET else default
+
+    def keys(self):
+        return EVENT_FIELDS
+
+    def items(self):
+        return list(zip(EVENT_FIELDS, self.as_tuple()))
+
+    def as_tuple(self):
+        return tuple(getattr(self, f) for f in EVENT_FIELDS)
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        return isinstance(other, EventRecord) and self.as_tuple() == other.as_tuple()
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (EventRecord, self.as_tuple())
+
+    def __repr__(self):
+        return f"EventRecord({self.title!r}, {self.dateTime!r}, {self.eventHash!r})"
+
+# Pattern scanner for the two payload types we read (instead of building a full DOM)
+_TAG_ATTRS = r"""((?:[^>"']|"[^"]*"|'[^']*')*)"""
+_SCRIPT_RE = re.compile(r"<script\b" + _TAG_ATTRS + r">(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+_DIV_RE = re.compile(r"<div\b" + _TAG_ATTRS + r">", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>"']+)))?""")
+
+def _parse_attrs(attr_text):
+    """Attribute dict for a tag's attribute text (names lowercased, values unescaped, first wins)"""
+    attrs = {}
+    for m in _ATTR_RE.finditer(attr_text):
+        name = m.group(1).lower()
+        if name in attrs:
+            continue
+        value = next((g for g in m.group(2, 3, 4) if g is not None), "")
+        attrs[name] = html.unescape(value)
+    return attrs
+
+class FastPayloads:
+    """JSON-LD script bodies and data-props values found by a strict pattern scan"""
+
+    def __init__(self, html_content):
+        self.html = html_content
+
+    def ld_json(self):
+        for m in _SCRIPT_RE.finditer(self.html):
+            if _parse_attrs(m.group(1)).get("type") == "application/ld+json":
+                yield m.group(2)
+
+    def data_props(self):
+        if "data-props" not in self.html:
+            return
+        for m in _DIV_RE.finditer(self.html):
+            if "data-props" not in m.group(1):
+                continue
+            attrs = _parse_attrs(m.group(1))
+            if "data-props" in attrs:
+                yield attrs["data-props"]
+
+class SoupPayloads:
+    """Same payloads via a full BeautifulSoup parse (reference implementation)"""
+
+    def __init__(self, html_content):
+        from bs4 import BeautifulSoup
+        self.soup = BeautifulSoup(html_content, 'html.parser')
+
+    def ld_json(self):
+        for script in self.soup.find_all('script', type='application/ld+json'):
+            yield script.string
+
+    def data_props(self):
+        for div in self.soup.find_all('div', attrs={'data-props': True}):
+            yield div['data-props']
+
+# "fast" (pattern scan, BeautifulSoup fallback) or "soup"
+EXTRACT_PARSER = os.getenv("SCRAPER_PARSER", "fast")
+
+def extract_eventbrite_api_data(html_content, city, parser=None, metrics=NULL_METRICS):
     """
     Extract events from Eventbrite's hidden JSON API embedded in page
     More reliable than scraping HTML elements
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    with metrics.stage("parse"):
+        events = list(iter_eventbrite_events(html_content, city, parser, metrics))
+    metrics.add("eventsExtracted", len(events))
+    return events
+
+def iter_eventbrite_events(html_content, city, parser=None, metrics=NULL_METRICS):
+    """
+    Lazily yield events from a page, one JSON payload decoded at a time
+    The BeautifulSoup fallback only runs if the fast scan produced nothing
+    """
+    found = False
+    if (parser or EXTRACT_PARSER) == "fast":
+        try:
+            for event in iter_events_from_payloads(FastPayloads(html_content), city, metrics):
+                found = True
+                yield event
+            if found or ("application/ld+json" not in html_content and "data-props" not in html_content):
+                return
+            logger.debug("Fast extractor found no events - falling back to BeautifulSoup")
+        except Exception as e:
+            if found:
+                logger.warning(f"Fast extractor failed part-way ({e}) - keeping events found so far")
+                return
+            logger.warning(f"Fast extractor failed ({e}) - falling back to BeautifulSoup")
+    
+    yield from iter_events_from_payloads(SoupPayloads(html_content), city, metrics)
+
+def metered_events(events, metrics):
+    """Pass a lazy event stream through, counting it and the time spent producing it (parse stage)"""
+    iterator = iter(events)
+    seconds = 0.0
+    count = 0
+    try:
+        while True:
+            t0 = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                seconds += time.perf_counter() - t0
+            count += 1
+            yield item
+    finally:
+        metrics.add_time("parse", seconds)
+        metrics.add("eventsExtracted", count)
+
+def iter_events_from_payloads(payloads, city, metrics=NULL_METRICS, now=None):
+    """
+    Yield EventRecords from JSON-LD blocks, or data-props when there are none
+    The timestamp and past-event cutoff are computed once per call, not per event.
+    Date parsing and hashing time is summed per page (parse_dates / hashing stages)
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - PAST_EVENT_GRACE
+    default_summary = f"Event in {city.title()}"
+    date_seconds = hash_seconds = 0.0
+    date_calls = hash_calls = 0
     
     # Method 1: Find JSON-LD structured data
-    events = []
-    for script in soup.find_all('script', type='application/ld+json'):
+    found = False
+    for script_body in payloads.ld_json():
         try:
-            data = json.loads(script.string)
+            data = json.loads(script_body)
             if isinstance(data, list):
                 data = [d for d in data if d.get('@type') == 'Event']
             elif data.get('@type') != 'Event':
@@ -96,47 +614,50 @@ def extract_eventbrite_api_data(html_content, city):
             
             for item in items:
                 try:
+                    t0 = time.perf_counter()
                     start_date = parse_eventbrite_date(item.get('startDate'))
                     end_date = parse_eventbrite_date(item.get('endDate', start_date))
+                    date_seconds += time.perf_counter() - t0
+                    date_calls += 1
                     
                     # Skip past events (except very recent ones)
-                    if start_date < datetime.utcnow() - timedelta(hours=6):
+                    if start_date < cutoff:
+                        continue
+                    
+                    # Skip if missing critical data
+                    title = item.get('name', '').strip()
+                    if len(title) < 5:
                         continue
                     
                     venue = item.get('location', {})
                     address = venue.get('address', {})
+                    description = item.get('description', '')
                     
-                    event = {
-                        "title": item.get('name', '').strip(),
-                        "shortSummary": item.get('description', '')[:200] if item.get('description') else f"Event in {city.title()}",
-                        "description": item.get('description', ''),
-                        "dateTime": start_date,
-                        "endDateTime": end_date,
-                        "venueName": venue.get('name', 'Venue TBD'),
-                        "venueAddress": address.get('streetAddress', ''),
-                        "city": address.get('addressLocality', city).title(),
-                        "imageUrl": item.get('image', None),
-                        "sourceName": "Eventbrite",
-                        "sourceUrl": item.get('url', ''),
-                        "sourceEventId": str(item.get('identifier', '')),
-                        "category": [item.get('category', 'Event')] if item.get('category') else ['General'],
-                        "tags": item.get('keywords', '').split(',') if item.get('keywords') else [],
-                        "status": "new",
-                        "lastScrapedAt": datetime.utcnow()
-                    }
-                    
-                    # Generate hash AFTER we have all required fields
-                    event["eventHash"] = generate_event_hash(
-                        event["title"],
-                        event["dateTime"],
-                        event["sourceUrl"]
+                    event = EventRecord(
+                        title=title,
+                        shortSummary=description[:200] if description else default_summary,
+                        description=description,
+                        dateTime=start_date,
+                        endDateTime=end_date,
+                        venueName=venue.get('name', 'Venue TBD'),
+                        venueAddress=address.get('streetAddress', ''),
+                        city=address.get('addressLocality', city).title(),
+                        imageUrl=item.get('image', None),
+                        sourceName="Eventbrite",
+                        sourceUrl=item.get('url', ''),
+                        sourceEventId=str(item.get('identifier', '')),
+                        category=[item.get('category', 'Event')] if item.get('category') else ['General'],
+                        tags=item.get('keywords', '').split(',') if item.get('keywords') else [],
+                        lastScrapedAt=now
                     )
                     
-                    # Skip if missing critical data
-                    if not event["title"] or len(event["title"]) < 5:
-                        continue
+                    t0 = time.perf_counter()
+                    event.eventHash = generate_event_hash(title, start_date, event.sourceUrl)
+                    hash_seconds += time.perf_counter() - t0
+                    hash_calls += 1
                     
-                    events.append(event)
+                    found = True
+                    yield event
                 except Exception as e:
                     logger.debug(f"Error parsing event item: {e}")
                     continue
@@ -145,49 +666,52 @@ def extract_eventbrite_api_data(html_content, city):
             continue
     
     # Method 2: Fallback to data-props attributes (Eventbrite's React props)
-    if not events:
-        for div in soup.find_all('div', attrs={'data-props': True}):
+    if not found:
+        for raw_props in payloads.data_props():
             try:
-                props = json.loads(div['data-props'])
+                props = json.loads(raw_props)
                 event_list = props.get('events', [])
                 
                 for evt in event_list:
                     try:
+                        t0 = time.perf_counter()
                         start_date = parse_eventbrite_date(evt['start_date'])
                         end_date = parse_eventbrite_date(evt.get('end_date', start_date))
+                        date_seconds += time.perf_counter() - t0
+                        date_calls += 1
                         
-                        if start_date < datetime.utcnow() - timedelta(hours=6):
+                        if start_date < cutoff:
                             continue
                         
-                        event = {
-                            "title": evt['name'].strip(),
-                            "shortSummary": evt.get('summary', '')[:200] or f"Event in {city.title()}",
-                            "description": evt.get('description', ''),
-                            "dateTime": start_date,
-                            "endDateTime": end_date,
-                            "venueName": evt.get('venue', {}).get('name', 'Venue TBD'),
-                            "venueAddress": evt.get('venue', {}).get('address', ''),
-                            "city": evt.get('venue', {}).get('city', city).title(),
-                            "imageUrl": evt.get('image', {}).get('url', None),
-                            "sourceName": "Eventbrite",
-                            "sourceUrl": evt['url'],
-                            "sourceEventId": str(evt['id']),
-                            "category": evt.get('category', ['General']),
-                            "tags": evt.get('tags', []),
-                            "status": "new",
-                            "lastScrapedAt": datetime.utcnow()
-                        }
+                        title = evt['name'].strip()
+                        if len(title) < 5:
+                            continue
                         
-                        event["eventHash"] = generate_event_hash(
-                            event["title"],
-                            event["dateTime"],
-                            event["sourceUrl"]
+                        venue = evt.get('venue', {})
+                        event = EventRecord(
+                            title=title,
+                            shortSummary=evt.get('summary', '')[:200] or default_summary,
+                            description=evt.get('description', ''),
+                            dateTime=start_date,
+                            endDateTime=end_date,
+                            venueName=venue.get('name', 'Venue TBD'),
+                            venueAddress=venue.get('address', ''),
+                            city=venue.get('city', city).title(),
+                            imageUrl=evt.get('image', {}).get('url', None),
+                            sourceName="Eventbrite",
+                            sourceUrl=evt['url'],
+                            sourceEventId=str(evt['id']),
+                            category=evt.get('category', ['General']),
+                            tags=evt.get('tags', []),
+                            lastScrapedAt=now
                         )
                         
-                        if not event["title"] or len(event["title"]) < 5:
-                            continue
+                        t0 = time.perf_counter()
+                        event.eventHash = generate_event_hash(title, start_date, event.sourceUrl)
+                        hash_seconds += time.perf_counter() - t0
+                        hash_calls += 1
                         
-                        events.append(event)
+                        yield event
                     except Exception as e:
                         logger.debug(f"Error parsing data-props event: {e}")
                         continue
@@ -195,140 +719,529 @@ def extract_eventbrite_api_data(html_content, city):
                 logger.debug(f"Error parsing data-props: {e}")
                 continue
     
-    return events
+    if date_calls:
+        metrics.add_time("parse_dates", date_seconds, date_calls)
+    if hash_calls:
+        metrics.add_time("hashing", hash_seconds, hash_calls)
+
+# Parse stage process pool: "auto" = one worker per core (none on a single core), 0 = parse in-thread
+_parse_workers = os.getenv("SCRAPER_PARSE_WORKERS", "auto")
+PARSE_WORKERS = (os.cpu_count() or 1) if _parse_workers == "auto" else int(_parse_workers)
+if _parse_workers == "auto" and PARSE_WORKERS < 2:
+    PARSE_WORKERS = 0
+PARSE_CHUNK_BYTES = int(os.getenv("SCRAPER_PARSE_CHUNK_KB", "256")) * 1024   # JSON text per worker task
+PARSE_INLINE_BYTES = int(os.getenv("SCRAPER_PARSE_INLINE_KB", "64")) * 1024  # smaller pages skip the pool
 
-def scrape_with_requests(city="sydney", max_retries=3):
+class _GivenPayloads:
+    """Payloads already found by the parent's pattern scan"""
+
+    def __init__(self, ld_json=(), data_props=()):
+        self._ld_json = ld_json
+        self._data_props = data_props
+
+    def ld_json(self):
+        return iter(self._ld_json)
+
+    def data_props(self):
+        return iter(self._data_props)
+
+def _parse_payload_chunk(kind, payloads, city):
     """
-    Primary scraping method using requests + BeautifulSoup
-    Faster and more efficient than Playwright when it works
+    Worker process entry point: decode one chunk of JSON payloads into event tuples
+    Returns (tuples in EVENT_FIELDS order, stage timings) - no HTML or field names are sent back
     """
-    city_slug = city.lower().replace(" ", "-")
-    # base_url = f"https://www.eventbrite.com/d/australia--{city_slug}/events/"
-    base_url = os.getenv("SOURCE_URL")
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept-Language': 'en-AU,en;q=0.9',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Referer': 'https://www.eventbrite.com/',
-        'DNT': '1',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    }
+    metrics = RunMetrics(city)
+    given = _GivenPayloads(ld_json=payloads) if kind == "ld_json" else _GivenPayloads(data_props=payloads)
+    records = [e.as_tuple() for e in iter_events_from_payloads(given, city, metrics)]
+    return records, metrics.stages
+
+def _chunk_payloads(payloads, chunk_bytes):
+    """Group payload strings into lists of roughly chunk_bytes of text each"""
+    chunk, size = [], 0
+    for payload in payloads:
+        if chunk and size + len(payload) > chunk_bytes:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(payload)
+        size += len(payload)
+    if chunk:
+        yield chunk
+
+class ParsePool:
+    """
+    Process pool for the CPU-bound part of extraction (JSON decoding, dates, hashing)
+    The calling thread runs the cheap pattern scan and ships only the JSON payloads,
+    in chunks of ~chunk_bytes, to the workers, which return compact event tuples.
+    Small pages and workers=0 are parsed in-thread; a page whose workers fail is too,
+    and the pool is recreated for the next page.
+    """
+
+    def __init__(self, workers=PARSE_WORKERS, chunk_bytes=PARSE_CHUNK_BYTES, inline_bytes=PARSE_INLINE_BYTES):
+        self.workers = workers
+        self.chunk_bytes = chunk_bytes
+        self.inline_bytes = inline_bytes
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None and self.workers > 0:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                # spawn: forking a process that already runs fetch/write threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def extract(self, html_content, city, metrics=NULL_METRICS):
+        """List of events for a page (same result as extract_eventbrite_api_data)"""
+        if not self.workers or len(html_content) < self.inline_bytes:
+            return extract_eventbrite_api_data(html_content, city, metrics=metrics)
+        with metrics.stage("parse"):
+            events = list(self.iter_extract(html_content, city, metrics))
+        metrics.add("eventsExtracted", len(events))
+        return events
+
+    def iter_extract(self, html_content, city, metrics=NULL_METRICS):
+        """Lazily yield a page's events, keeping at most 2 x workers chunks in flight"""
+        if not self.workers or len(html_content) < self.inline_bytes:
+            yield from iter_eventbrite_events(html_content, city, metrics=metrics)
+            return
+        
+        payloads = FastPayloads(html_content)
+        found = False
+        try:
+            for event in self._map("ld_json", payloads.ld_json(), city, metrics):
+                found = True
+                yield event
+            if not found:
+                for event in self._map("data_props", payloads.data_props(), city, metrics):
+                    found = True
+                    yield event
+        except Exception as e:
+            self.close()  # a broken pool is recreated on the next call
+            if found:
+                logger.warning(f"Parse pool failed part-way ({e}) - keeping events found so far")
+                return
+            logger.warning(f"Parse pool failed ({e}) - parsing in-thread")
+            yield from iter_eventbrite_events(html_content, city, metrics=metrics)
+            return
+        
+        if not found and ("application/ld+json" in html_content or "data-props" in html_content):
+            logger.debug("Parse pool found no events - falling back to BeautifulSoup")
+            yield from iter_events_from_payloads(SoupPayloads(html_content), city, metrics)
+
+    def _map(self, kind, payloads, city, metrics):
+        pool = self._pool()
+        pending = []
+        chunks = _chunk_payloads(payloads, self.chunk_bytes)
+        for chunk in chunks:
+            pending.append(pool.submit(_parse_payload_chunk, kind, chunk, city))
+            if len(pending) >= 2 * self.workers:
+                yield from self._collect(pending.pop(0), metrics)
+        for future in pending:
+            yield from self._collect(future, metrics)
+
+    @staticmethod
+    def _collect(future, metrics):
+        records, stages = future.result()
+        for name, stage in stages.items():
+            metrics.add_time(name, stage["seconds"], stage["count"])
+        for record in records:
+            yield EventRecord(*record)
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+parse_pool = ParsePool()
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'en-AU,en;q=0.9',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Referer': 'https://www.eventbrite.com/',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+_thread_sessions = threading.local()
+
+def get_session():
+    """Per-thread pooled session, kept warm across runs (keep-alive connections survive)"""
+    session = getattr(_thread_sessions, "session", None)
+    if session is None:
+        session = _thread_sessions.session = make_session()
+    return session
+
+def make_session(pool_size=PAGE_WORKERS):
+    """requests.Session with a connection pool sized for concurrent page fetches"""
+    import requests
+    import requests.adapters
     
     session = requests.Session()
-    session.headers.update(headers)
+    session.headers.update(REQUEST_HEADERS)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def page_url(base_url, page):
+    """Listing URL for a results page (page 1 is the base URL itself)"""
+    if page <= 1:
+        return base_url
+    parts = urlparse(base_url)
+    query = parse_qs(parts.query)
+    query["page"] = [str(page)]
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+def fetch_listing_page(session, url, city, max_retries=3, page=1, metrics=NULL_METRICS):
+    """
+    Fetch and extract one listing page with retries
+    Returns a ListingPage of events, an UnchangedPage when the cached copy is still current,
+    or None if the page could not be scraped. Empty results are only retried on page 1.
+    Outcomes are reported to the host circuit breaker.
+    """
+    import requests
+    
+    host = urlparse(url).netloc
+    failure = "error"
     
     for attempt in range(max_retries):
         try:
-            logger.info(f"_attempt {attempt + 1}/{max_retries} for {city.title()}")
-            response = session.get(base_url, timeout=30)
+            logger.info(f"_attempt {attempt + 1}/{max_retries} for {city.title()} page {page}")
+            cached = response_cache.get(url, LISTING_CACHE_VERSION) if HTTP_CACHE_ENABLED else None
+            if cached and "eventHashes" not in cached:
+                cached = None
+            throttle(url)
+            with metrics.stage("fetch"):
+                response = session.get(url, timeout=30, headers=response_cache.conditional_headers(cached))
+            metrics.add("bytesDownloaded", len(response.content))
+            
+            if response.status_code == 304:
+                logger.info(f"⚪ {city.title()} page {page} not modified (304) - skipping parse")
+                host_health.record_success(host)
+                return UnchangedPage(url, cached["eventHashes"])
             response.raise_for_status()
             
             # Check if we got blocked (Cloudflare, etc.)
             if "just a moment" in response.text.lower() or "cloudflare" in response.text.lower():
                 logger.warning("Blocked by Cloudflare - switching to Playwright fallback")
+                host_health.record_failure(host, "blocked", immediate=True)
                 return None
             
-            events = extract_eventbrite_api_data(response.text, city)
+            if cached and cached.get("bodyHash") == ResponseCache.body_hash(response.content):
+                logger.info(f"⚪ {city.title()} page {page} identical to cached copy - skipping parse")
+                host_health.record_success(host)
+                return UnchangedPage(url, cached["eventHashes"])
+            
+            events = parse_pool.extract(response.text, city, metrics=metrics)
             
             if events:
-                logger.info(f"✅ Extracted {len(events)} events via requests (attempt {attempt + 1})")
-                return events
+                cache_entry = None
+                if HTTP_CACHE_ENABLED:
+                    cache_entry = response_cache.entry(url, response, LISTING_CACHE_VERSION,
+                                                       eventHashes=[e["eventHash"] for e in events])
+                logger.info(f"✅ Extracted {len(events)} events for {city.title()} page {page} via requests (attempt {attempt + 1})")
+                host_health.record_success(host)
+                return ListingPage(events, cache_entry)
+            elif page > 1:
+                return []
             else:
+                failure = "empty"
                 logger.warning(f"No events found on attempt {attempt + 1}")
                 time.sleep(2 ** attempt)  # Exponential backoff
                 
         except requests.exceptions.RequestException as e:
+            failure = "error"
             logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
             time.sleep(2 ** attempt)
         except Exception as e:
             logger.error(f"Unexpected error during requests scrape: {e}")
             break
     
-    logger.warning("All requests attempts failed - switching to Playwright fallback")
+    if page == 1:
+        host_health.record_failure(host, failure)
     return None
 
-def scrape_with_playwright(city="sydney", max_scrolls=6):
+def scrape_with_requests(city="sydney", max_retries=3, max_pages=MAX_PAGES, metrics=NULL_METRICS):
     """
-    Fallback scraping method using Playwright
-    More robust against anti-bot measures but slower
+    Primary scraping method using requests + BeautifulSoup
+    Faster and more efficient than Playwright when it works
+    Page 1 is fetched up front; returns None if it fails, otherwise an iterator
+    of per-page batches (see iter_listing_pages) for sync_batches to consume
     """
-    try:
-        from playwright.sync_api import sync_playwright
-        
-        city_slug = city.lower().replace(" ", "-")
-        url = f"https://www.eventbrite.com/d/australia--{city_slug}/events/"
-        
-        logger.info(f"🕷️ Starting Playwright scrape for {city.title()}")
+    base_url = build_source_url(city)
+    host = urlparse(base_url).netloc
+    
+    health = host_health.check(host)
+    if health == OPEN:
+        logger.warning(f"⛔ {host} is in cooldown after recent blocks - skipping requests path")
+        return None
+    if health == PROBE:
+        logger.info(f"🩺 Probing {host} with a single requests attempt")
+        max_retries = 1
+    
+    session = get_session()
+    first = fetch_listing_page(session, base_url, city, max_retries, metrics=metrics)
+    if first is None:
+        logger.warning("All requests attempts failed - switching to Playwright fallback")
+        return None
+    
+    return iter_listing_pages(session, base_url, city, first, max_retries, max_pages, metrics)
+
+def iter_listing_pages(session, base_url, city, first, max_retries=3, max_pages=MAX_PAGES, metrics=NULL_METRICS):
+    """
+    Yield page 1, then pages 2..max_pages fetched concurrently, in completion order
+    The next pages are requested before each yield, so they download while the
+    consumer writes the current one. Stops scheduling new pages once a page comes
+    back with no upcoming events
+    """
+    if max_pages <= 1:
+        yield first
+        return
+    
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+        pending = {}
+        next_page = 2
+        exhausted = False
+        first_pending = True
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-dev-shm-usage",
-                    "--no-sandbox",
-                    "--disable-gpu",
-                    "--disable-extensions",
-                    "--mute-audio",
-                    "--no-default-browser-check",
-                    "--no-first-run",
-                    "--disable-features=IsolateOrigins,site-per-process"
-                ]
-            )
+        while pending or (not exhausted and next_page <= max_pages):
+            while not exhausted and next_page <= max_pages and len(pending) < PAGE_WORKERS:
+                url = page_url(base_url, next_page)
+                pending[pool.submit(fetch_listing_page, session, url, city, max_retries, next_page, metrics)] = next_page
+                next_page += 1
             
-            context = browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                locale="en-AU",
-                timezone_id="Australia/Sydney",
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                java_script_enabled=True,
-                bypass_csp=True
-            )
+            if first_pending:
+                first_pending = False
+                yield first
+                continue
             
-            # Anti-detection scripts
-            context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-                Object.defineProperty(navigator, 'languages', {get: () => ['en-AU', 'en']});
-                Object.defineProperty(navigator, 'hardwareConcurrency', {get: () => 8});
-                Object.defineProperty(navigator, 'deviceMemory', {get: () => 8});
-                Object.defineProperty(navigator, 'platform', {get: () => 'Win32'});
-                window.chrome = { runtime: {} };
-                window.navigator.permissions.query = Promise.resolve({ state: 'granted' }).bind(Promise);
-            """)
+            done = next(as_completed(pending))
+            page = pending.pop(done)
+            batch = done.result()
             
-            page = context.new_page()
+            if not batch:
+                if not exhausted:
+                    logger.info(f"📄 {city.title()} page {page} has no upcoming events - stopping pagination")
+                exhausted = True
+                continue
             
-            # Navigate with timeout and error handling
+            yield batch
+
+# Playwright fallback settings
+SCROLL_DEADLINE = float(os.getenv("SCRAPER_SCROLL_DEADLINE", "20"))   # seconds per page
+SCROLL_SETTLE_MS = int(os.getenv("SCRAPER_SCROLL_SETTLE_MS", "1500"))  # wait for new cards after a scroll
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+TRACKER_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "facebook.net",
+    "facebook.com", "hotjar.com", "segment.io", "segment.com", "optimizely.com",
+    "nr-data.net", "newrelic.com", "bing.com", "tiktok.com", "cookielaw.org", "onetrust.com",
+)
+
+# Counts event cards plus JSON-LD blocks; scrolling stops once this stops growing
+EVENT_COUNT_JS = """() => document.querySelectorAll('a[href*="/e/"]').length
+    + document.querySelectorAll('script[type="application/ld+json"]').length"""
+
+ANTI_DETECTION_JS = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+    Object.defineProperty(navigator, 'languages', {get: () => ['en-AU', 'en']});
+    Object.defineProperty(navigator, 'hardwareConcurrency', {get: () => 8});
+    Object.defineProperty(navigator, 'deviceMemory', {get: () => 8});
+    Object.defineProperty(navigator, 'platform', {get: () => 'Win32'});
+    window.chrome = { runtime: {} };
+    window.navigator.permissions.query = Promise.resolve({ state: 'granted' }).bind(Promise);
+"""
+
+def _block_heavy_resources(route):
+    """Abort images, fonts, media and third-party trackers"""
+    request = route.request
+    host = urlparse(request.url).netloc
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host.endswith(t) for t in TRACKER_HOSTS):
+        route.abort()
+    else:
+        route.continue_()
+
+class BrowserPool:
+    """
+    One warm Chromium browser + context reused across cities in this process
+    Playwright's sync API is bound to the thread that started it, so every call
+    runs on a single dedicated thread; callers from any thread go through run()
+    """
+
+    def __init__(self):
+        self._executor = None  # created on first run() so an unused pool costs nothing
+        self._lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._context = None
+
+    def run(self, fn, *args, metrics=NULL_METRICS):
+        """Call fn(context, *args) on the browser thread and return its result"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playwright")
+        return self._executor.submit(self._call, fn, args, metrics).result()
+
+    def _call(self, fn, args, metrics):
+        if self._context is None:
+            with metrics.stage("playwright_launch"):
+                self._ensure_context()
+        context = self._context
+        try:
+            return fn(context, *args)
+        except Exception:
+            # A crashed browser is relaunched on the next call
+            if self._browser is not None and not self._browser.is_connected():
+                self._shutdown()
+            raise
+
+    def _ensure_context(self):
+        if self._context is not None:
+            return self._context
+        
+        from playwright.sync_api import sync_playwright
+        
+        t0 = time.time()
+        self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(
+            headless=True,
+            args=[
+                "--disable-blink-features=AutomationControlled",
+                "--disable-dev-shm-usage",
+                "--no-sandbox",
+                "--disable-gpu",
+                "--disable-extensions",
+                "--mute-audio",
+                "--no-default-browser-check",
+                "--no-first-run",
+                "--disable-features=IsolateOrigins,site-per-process"
+            ]
+        )
+        
+        self._context = self._browser.new_context(
+            viewport={"width": 1920, "height": 1080},
+            locale="en-AU",
+            timezone_id="Australia/Sydney",
+            user_agent=REQUEST_HEADERS["User-Agent"],
+            java_script_enabled=True,
+            bypass_csp=True
+        )
+        
+        # Anti-detection scripts and resource blocking, set up once per context
+        self._context.add_init_script(ANTI_DETECTION_JS)
+        self._context.route("**/*", _block_heavy_resources)
+        
+        logger.info(f"🕷️ Browser pool started in {time.time() - t0:.1f}s")
+        return self._context
+
+    def _shutdown(self):
+        for closer in (self._context, self._browser):
             try:
-                page.goto(url, timeout=60000, wait_until="networkidle")
-                page.wait_for_timeout(3000)
-            except Exception as e:
-                logger.error(f"Failed to load page: {e}")
-                browser.close()
-                return []
-            
-            # Accept cookies if present
+                if closer is not None:
+                    closer.close()
+            except Exception:
+                pass
+        if self._playwright is not None:
             try:
-                page.click('button[data-testid="accept-cookies"], #onetrust-accept-btn-handler, button:has-text("Accept")', timeout=5000)
-                page.wait_for_timeout(1500)
-            except:
+                self._playwright.stop()
+            except Exception:
                 pass
-            
-            # Scroll to load more events
-            for i in range(max_scrolls):
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                page.wait_for_timeout(2000 + i * 500)  # Increasing delay
-            
-            # Extract page content
-            content = page.content()
-            browser.close()
-            
-            events = extract_eventbrite_api_data(content, city)
-            logger.info(f"✅ Extracted {len(events)} events via Playwright")
-            return events
+        self._playwright = self._browser = self._context = None
+
+    def close(self):
+        """Shut the browser down (call before process exit)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        executor.submit(self._shutdown).result()
+        executor.shutdown(wait=True)
+
+browser_pool = BrowserPool()
+
+def scroll_until_stable(page, max_scrolls, deadline):
+    """Scroll until the event count stops growing, max_scrolls is hit or the deadline passes"""
+    count = page.evaluate(EVENT_COUNT_JS)
+    for i in range(max_scrolls):
+        if time.time() >= deadline:
+            break
+        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        try:
+            page.wait_for_function(
+                f"(prev) => ({EVENT_COUNT_JS})() > prev",
+                arg=count,
+                timeout=max(1, min(SCROLL_SETTLE_MS, (deadline - time.time()) * 1000))
+            )
+        except Exception:
+            break  # nothing new loaded
+        count = page.evaluate(EVENT_COUNT_JS)
+    return count
+
+def _playwright_fetch(context, city, url, max_scrolls, metrics=NULL_METRICS):
+    """Load a listing page in the pooled context and return its HTML (or None)"""
+    page = context.new_page()
+    try:
+        deadline = time.time() + SCROLL_DEADLINE
+        
+        # Navigate with timeout and error handling
+        try:
+            throttle(url)
+            with metrics.stage("playwright_load"):
+                page.goto(url, timeout=60000, wait_until="domcontentloaded")
+                page.wait_for_function(f"() => ({EVENT_COUNT_JS})() > 0", timeout=10000)
+        except Exception as e:
+            logger.error(f"Failed to load page: {e}")
+            return None
+        
+        # Accept cookies if present
+        try:
+            page.click('button[data-testid="accept-cookies"], #onetrust-accept-btn-handler, button:has-text("Accept")', timeout=1000)
+        except Exception:
+            pass
+        
+        # Scroll to load more events
+        with metrics.stage("playwright_scroll"):
+            count = scroll_until_stable(page, max_scrolls, deadline)
+        logger.info(f"🕷️ {city.title()}: {count} event elements after scrolling")
+        
+        # Extract page content
+        content = page.content()
+        metrics.add("bytesDownloaded", len(content.encode("utf-8")))
+        return content
+    finally:
+        page.close()
+
+def scrape_with_playwright(city="sydney", max_scrolls=6, metrics=NULL_METRICS):
+    """
+    Fallback scraping method using Playwright
+    More robust against anti-bot measures but slower
+    Uses the shared browser pool; the browser is only launched on first use
+    Returns a lazy event stream (extracted as the sync stage consumes it), or [] on failure
+    """
+    try:
+        city_slug = city.lower().replace(" ", "-")
+        url = f"https://www.eventbrite.com/d/australia--{city_slug}/events/"
+        
+        logger.info(f"🕷️ Starting Playwright scrape for {city.title()}")
+        
+        content = browser_pool.run(_playwright_fetch, city, url, max_scrolls, metrics, metrics=metrics)
+        if not content:
+            return []
+        
+        events = metered_events(parse_pool.iter_extract(content, city, metrics=metrics), metrics)
+        first = next(events, None)
+        if first is None:
+            logger.warning(f"No events found for {city.title()} via Playwright")
+            return []
+        logger.info(f"✅ Streaming events for {city.title()} via Playwright")
+        return chain([first], events)
             
     except ImportError:
         logger.error("Playwright not installed. Install with: pip install playwright && playwright install")
@@ -337,22 +1250,349 @@ def scrape_with_playwright(city="sydney", max_scrolls=6):
         logger.error(f"Playwright scrape failed: {e}")
         return []
 
+def parse_event_details(html_content):
+    """Full description, category (from the schema.org @type) and tags from a detail page's JSON-LD"""
+    details = {}
+    for body in FastPayloads(html_content).ld_json():
+        try:
+            data = json.loads(body)
+        except ValueError:
+            continue
+        for item in (data if isinstance(data, list) else [data]):
+            event_type = item.get("@type") if isinstance(item, dict) else None
+            if not isinstance(event_type, str) or not event_type.endswith("Event"):
+                continue
+            if isinstance(item.get("description"), str) and item["description"].strip():
+                details["description"] = item["description"].strip()
+            if event_type != "Event":
+                # MusicEvent -> Music, BusinessEvent -> Business
+                details["category"] = [re.sub(r"(?<=[a-z])(?=[A-Z])", " ", event_type[:-len("Event")])]
+            keywords = item.get("keywords")
+            if isinstance(keywords, str):
+                keywords = keywords.split(",")
+            if keywords:
+                details["tags"] = [k.strip() for k in keywords if isinstance(k, str) and k.strip()]
+            return details
+    return details
+
+def fetch_event_details(url, metrics=NULL_METRICS):
+    """
+    Fetch and parse one detail page through the shared session, token bucket and
+    circuit breaker. Returns a (possibly empty) dict of fields, or None on failure.
+    The breaker is only read (a probe slot and closing the circuit belong to the
+    listing path); a hard block still opens it
+    """
+    import requests
+    
+    host = urlparse(url).netloc
+    if host_health.is_open(host):
+        return None
+    try:
+        throttle(url)
+        with metrics.stage("enrich_fetch"):
+            response = get_session().get(url, timeout=20)
+        metrics.add("bytesDownloaded", len(response.content))
+        if response.status_code in (404, 410):
+            return {}
+        response.raise_for_status()
+        if "just a moment" in response.text.lower():
+            host_health.record_failure(host, "blocked", immediate=True)
+            return None
+        return parse_event_details(response.text)
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"Detail fetch failed for {url}: {e}")
+        return None
+
+def detail_key(event):
+    return event["sourceEventId"] or event["eventHash"]
+
+# Fields apply_details() can overwrite with detail-page values
+ENRICHED_FIELDS = ("description", "category", "tags")
+
+def apply_details(event, details):
+    """Merge enriched fields into a scraped event (longer description, specific category, extra tags)"""
+    if len(details.get("description") or "") > len(event["description"] or ""):
+        event["description"] = details["description"]
+    if details.get("category") and event["category"] in (["General"], ["Event"]):
+        event["category"] = details["category"]
+    if details.get("tags"):
+        event["tags"] = list(dict.fromkeys(event["tags"] + details["tags"]))
+
+class DetailEnricher:
+    """
+    Concurrent detail-page fetcher for the enrichment stage
+    Only events whose listing fingerprint has not been enriched yet are passed in;
+    detail_cache answers repeats, and at most `budget` pages are fetched per call
+    """
+
+    def __init__(self, workers=ENRICH_WORKERS):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="enrich")
+            return self._executor
+
+    def enrich(self, candidates, budget, metrics=NULL_METRICS):
+        """
+        candidates: [(event, fingerprint)]
+        Returns ({eventHash: details}, number of pages fetched)
+        """
+        results = {}
+        to_fetch = []
+        for event, fingerprint in candidates:
+            details = detail_cache.get(detail_key(event), fingerprint)
+            if details is not None:
+                results[event["eventHash"]] = details
+            elif len(to_fetch) < budget and event["sourceUrl"]:
+                to_fetch.append((event, fingerprint))
+        
+        if to_fetch:
+            pool = self._pool()
+            futures = {pool.submit(fetch_event_details, event["sourceUrl"], metrics): (event, fingerprint)
+                       for event, fingerprint in to_fetch}
+            for future in as_completed(futures):
+                event, fingerprint = futures[future]
+                try:
+                    details = future.result()
+                except Exception as e:
+                    # One bad detail page must not abort the city's sync
+                    logger.warning(f"Detail enrichment failed for {event['sourceUrl']}: {e}")
+                    details = None
+                if details is not None:
+                    detail_cache.put(detail_key(event), fingerprint, details)
+                    results[event["eventHash"]] = details
+        return results, len(to_fetch)
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+enricher = DetailEnricher()
+
+def prefetch_existing(event_hashes, chunk_size=PREFETCH_CHUNK):
+    """
+    Load stored state for the given hashes with chunked $in queries
+    Returns {eventHash: doc} with only the fields the diff needs
+    """
+    existing = {}
+    projection = {"_id": 0, "eventHash": 1, "contentHash": 1, "canonicalHash": 1, "enrichedHash": 1,
+                  "fieldHashes": 1, "status": 1, "title": 1, "dateTime": 1}
+    for i in range(0, len(event_hashes), chunk_size):
+        chunk = event_hashes[i:i + chunk_size]
+        for doc in events_col().find({"eventHash": {"$in": chunk}}, projection):
+            existing[doc["eventHash"]] = doc
+    return existing
+
+def classify_event(event, existing):
+    """Decide the status to store for a scraped event given its stored doc (or None)"""
+    if not existing:
+        return "new"
+    
+    # Preserve "imported" status unless event details changed significantly
+    if existing.get("status") == "imported":
+        # Only update if critical fields changed
+        stored_dt = existing.get("dateTime")
+        critical_changed = (
+            event["title"] != existing.get("title") or
+            (stored_dt is not None and
+             abs((to_utc_naive(event["dateTime"]) - to_utc_naive(stored_dt)).total_seconds()) > 3600)
+        )
+        return "updated" if critical_changed else "imported"
+    
+    return "updated" if existing.get("status") != "new" else "new"
+
 def sync_to_mongo(events, city="Sydney", source="Eventbrite"):
     """
     Sync events to MongoDB with proper deduplication and status management
     Returns statistics dictionary
     """
-    if not events:
-        logger.warning("⚠️ No events to sync")
-        return {"new": 0, "updated": 0, "unchanged": 0, "inactive": 0}
+    return sync_batches([events], city=city, source=source)
+
+def next_run_generation():
+    """
+    Global monotonic run counter; events are stamped with the generation of the last
+    run that saw them, so "not seen by this run" is a range query on lastSeenRun
+    """
+    from pymongo import ReturnDocument
     
-    stats = {"new": 0, "updated": 0, "unchanged": 0, "inactive": 0}
-    scraped_hashes = {e["eventHash"] for e in events}
+    counter = counters_col().find_one_and_update(
+        {"_id": "scrapeRun"},
+        {"$inc": {"seq": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter["seq"]
+
+class BulkWriter:
+    """
+    Runs one chunk's writes at a time on a background thread, so the next chunk
+    can be fetched, extracted and diffed while the previous bulk_write is in flight
+    Delta entries for a chunk are collected in `changes` once its write has completed
+    """
+
+    def __init__(self, stats, metrics=NULL_METRICS):
+        self.stats = stats
+        self.metrics = metrics
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bulk-write")
+        self.pending = None
+        self.pending_changes = ()
+        self.pending_callbacks = []
+        self.changes = []  # (eventHash, changed fields or None if added)
+        self.listing_keys = set()  # listing_key() of every parsed event this run
+
+    def submit(self, bulk_ops, unchanged_hashes, generation, changes=()):
+        self.wait()
+        self.pending = self.executor.submit(self._write, bulk_ops, unchanged_hashes, generation)
+        self.pending_changes = changes
+
+    def _write(self, bulk_ops, unchanged_hashes, generation):
+        result = None
+        if bulk_ops:
+            with self.metrics.stage("bulk_write"):
+                result = events_col().bulk_write(bulk_ops, ordered=False)
+        if unchanged_hashes:
+            with self.metrics.stage("mongo_touch"):
+                touch_unchanged(unchanged_hashes, generation)
+        return result
+
+    def wait(self):
+        """Block until the in-flight write is done and count its results"""
+        if self.pending is None:
+            return
+        pending, self.pending = self.pending, None
+        result = pending.result()
+        if result is not None:
+            self.stats["new"] += result.upserted_count
+            self.stats["updated"] += result.modified_count
+        self.changes.extend(self.pending_changes)
+        self.pending_changes = ()
+        callbacks, self.pending_callbacks = self.pending_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def after_write(self, callback):
+        """Run callback once everything submitted so far has been written (never, if a write fails)"""
+        if self.pending is None:
+            callback()
+        else:
+            self.pending_callbacks.append(callback)
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            self.executor.shutdown(wait=True)
+
+def sync_batch(batch, stats, generation, writer, metrics=NULL_METRICS):
+    """
+    Diff and write one batch of events (a list or any iterable), or record an UnchangedPage
+    Events are consumed WRITE_BATCH at a time, so lazy batches are never held in full
+    """
+    if isinstance(batch, UnchangedPage):
+        writer.submit([], batch.event_hashes, generation)
+        stats["unchanged"] += len(batch.event_hashes)
+        stats["fetched"] += len(batch.event_hashes)
+        return
+    
+    stats["pagesChanged"] += 1
+    events = iter(batch)
+    while True:
+        chunk = list(islice(events, WRITE_BATCH))
+        if not chunk:
+            break
+        stats["fetched"] += len(chunk)
+        # Prefetch must see the previous chunk's upserts (the same event can appear twice)
+        writer.wait()
+        sync_chunk(chunk, stats, generation, writer, metrics)
+    
+    if getattr(batch, "cache_entry", None):
+        writer.after_write(lambda: store_listing_cache(batch.cache_entry))
+
+def store_listing_cache(entry):
+    """Record a listing page as cached (its events are in Mongo, so later 304s can skip it)"""
+    try:
+        response_cache.store(entry)
+    except OSError as e:
+        logger.warning(f"Could not write response cache entry for {entry['url']}: {e}")
+
+def sync_chunk(chunk, stats, generation, writer, metrics=NULL_METRICS):
+    """
+    Prefetch, diff, enrich and queue the writes for up to WRITE_BATCH events
+    Events whose listing content (contentHash) has no enrichment stored yet - new or
+    changed ones - get detail-page fields, from detail_cache or a budgeted fetch
+    """
+    from pymongo import UpdateOne
     
     # Bulk operations for efficiency
     bulk_ops = []
+    unchanged_hashes = []
+    changes = []
+    writes = []
+    candidates = []
+    with metrics.stage("mongo_prefetch"):
+        existing_by_hash = prefetch_existing(list({e["eventHash"] for e in chunk}))
     
-    for event in events:
+    hash_seconds = 0.0
+    for event in chunk:
+        writer.listing_keys.add(listing_key(event))
+        existing = existing_by_hash.get(event["eventHash"])
+        t0 = time.perf_counter()
+        content_hash = generate_content_hash(event)
+        hash_seconds += time.perf_counter() - t0
+        status = classify_event(event, existing)
+        canonical = link_near_duplicate(event)
+        if canonical:
+            stats["duplicates"] += 1
+        
+        # Same content, status and duplicate link as stored: nothing to write (unless enrichment is due)
+        same = bool(existing and existing.get("contentHash") == content_hash and existing.get("status") == status
+                    and existing.get("canonicalHash") == canonical)
+        needs_details = ENRICH_ENABLED and (not existing or existing.get("enrichedHash") != content_hash)
+        if same and not needs_details:
+            unchanged_hashes.append(event["eventHash"])
+            continue
+        if needs_details:
+            candidates.append((event, content_hash))
+        writes.append((event, content_hash, status, canonical, existing, same))
+    
+    metrics.add_time("hashing", hash_seconds, len(chunk))
+    
+    enriched = {}
+    if candidates:
+        with metrics.stage("enrich"):
+            enriched, fetched = enricher.enrich(candidates, max(0, ENRICH_MAX_PER_RUN - stats["detailFetches"]), metrics)
+        stats["detailFetches"] += fetched
+        stats["enriched"] += len(enriched)
+    
+    for event, content_hash, status, canonical, existing, same in writes:
+        details = enriched.get(event["eventHash"])
+        if details is None and same:
+            # No details yet (budget spent): retried the next time this listing page is parsed
+            unchanged_hashes.append(event["eventHash"])
+            continue
+        if details:
+            apply_details(event, details)
+        # Rewritten without fresh details: keep the fields enriched earlier rather than
+        # overwriting them with the listing's own values
+        keep_enriched = details is None and bool(existing and existing.get("enrichedHash"))
+        
+        digests = field_digests(event)
+        if keep_enriched:
+            stored = existing.get("fieldHashes") or {}
+            digests.update({f: stored[f] for f in ENRICHED_FIELDS if f in stored})
+        if not existing:
+            changes.append((event["eventHash"], None))
+        else:
+            fields = changed_fields(existing, digests, status, canonical)
+            if fields:
+                changes.append((event["eventHash"], fields))
+        
         # Prepare update document
         update_doc = {
             "$set": {
@@ -364,38 +1604,30 @@ def sync_to_mongo(events, city="Sydney", source="Eventbrite"):
                 "venueName": event["venueName"],
                 "venueAddress": event["venueAddress"],
                 "city": event["city"],
+                "cityKey": city_key(event["city"]),
+                "searchTokens": build_search_tokens(event),
                 "imageUrl": event["imageUrl"],
                 "sourceName": event["sourceName"],
                 "sourceUrl": event["sourceUrl"],
                 "sourceEventId": event["sourceEventId"],
                 "category": event["category"],
                 "tags": event["tags"],
+                "contentHash": content_hash,
+                "fieldHashes": digests,
+                "canonicalHash": canonical,
+                "status": status,
+                "lastSeenRun": generation,
                 "lastScrapedAt": event["lastScrapedAt"]
             },
             "$setOnInsert": {
                 "createdAt": datetime.utcnow()
             }
         }
-        
-        # Determine status logic
-        existing = events_col.find_one({"eventHash": event["eventHash"]}, {"status": 1, "_id": 0})
-        
-        if existing:
-            # Preserve "imported" status unless event details changed significantly
-            if existing.get("status") == "imported":
-                # Only update if critical fields changed
-                critical_changed = (
-                    event["title"] != existing.get("title") or
-                    abs((event["dateTime"] - existing.get("dateTime", event["dateTime"])).total_seconds()) > 3600
-                )
-                if critical_changed:
-                    update_doc["$set"]["status"] = "updated"
-                else:
-                    update_doc["$set"]["status"] = "imported"  # Keep imported status
-            else:
-                update_doc["$set"]["status"] = "updated" if existing.get("status") != "new" else "new"
-        else:
-            update_doc["$set"]["status"] = "new"
+        if details is not None:
+            update_doc["$set"]["enrichedHash"] = content_hash
+        elif keep_enriched:
+            for field in ENRICHED_FIELDS:
+                del update_doc["$set"][field]
         
         bulk_ops.append(
             UpdateOne(
@@ -405,32 +1637,181 @@ def sync_to_mongo(events, city="Sydney", source="Eventbrite"):
             )
         )
     
-    # Execute bulk operations
-    if bulk_ops:
-        result = events_col.bulk_write(bulk_ops, ordered=False)
-        stats["new"] = result.upserted_count
-        stats["updated"] = result.modified_count
-        stats["unchanged"] = len(events) - stats["new"] - stats["updated"]
+    # Execute bulk operations (in the background - see BulkWriter)
+    stats["unchanged"] += len(unchanged_hashes)
+    writer.submit(bulk_ops, unchanged_hashes, generation, changes if DELTAS_ENABLED else ())
+
+def link_near_duplicate(event):
+    """eventHash of the canonical event this one near-duplicates, or None"""
+    if not NEAR_DUPES_ENABLED:
+        return None
+    text = " ".join(_WORD_RE.findall(normalize_text(f"{event['title']} {event['venueName'] or ''}")))
+    return near_dupes.link(event["eventHash"], text, to_utc_naive(event["dateTime"]).date(),
+                           city_key(event["city"]), "\x1f".join(listing_key(event)))
+
+def listing_key(event):
+    """Identity of the listing across reschedules / renames: its source event id, else its URL"""
+    if event["sourceEventId"]:
+        return ("sourceEventId", event["sourceEventId"])
+    return ("sourceUrl", event["sourceUrl"] or "")
+
+def superseded_events(source, city, generation, listing_keys):
+    """
+    eventHashes of stored events this run's listings replace: same source event id
+    (or URL, for listings without one) but an older title / date, so not seen this run
+    """
+    by_field = {}
+    for field, value in listing_keys:
+        if value:
+            by_field.setdefault(field, []).append(value)
+    
+    hashes = []
+    for field, values in by_field.items():
+        for i in range(0, len(values), PREFETCH_CHUNK):
+            query = {
+                "sourceName": source,
+                "city": city.title(),
+                field: {"$in": values[i:i + PREFETCH_CHUNK]},
+                "$or": [{"lastSeenRun": {"$lt": generation}}, {"lastSeenRun": None}],
+                "status": {"$nin": ["inactive", "imported"]},
+            }
+            if field == "sourceUrl":
+                query["sourceEventId"] = {"$in": ["", None]}
+            hashes.extend(doc["eventHash"] for doc in events_col().find(query, {"_id": 0, "eventHash": 1}))
+    return hashes
+
+def stale_canonicals(source, city, generation):
+    """Canonical events not seen this run that have a duplicate which was"""
+    linked = events_col().distinct("canonicalHash", {
+        "sourceName": source, "city": city.title(), "lastSeenRun": generation, "canonicalHash": {"$ne": None}
+    })
+    stale = []
+    for i in range(0, len(linked), PREFETCH_CHUNK):
+        stale.extend(doc["eventHash"] for doc in events_col().find(
+            {"eventHash": {"$in": linked[i:i + PREFETCH_CHUNK]}, "status": {"$ne": "inactive"},
+             "$or": [{"lastSeenRun": {"$lt": generation}}, {"lastSeenRun": None}]},
+            {"_id": 0, "eventHash": 1}
+        ))
+    return stale
+
+def promote_duplicates(old_canonicals, retired=True):
+    """
+    Re-point the near-duplicates of canonical events that went inactive (retired) or
+    were not seen this run (retired=False - they are demoted into the group). Per
+    group the duplicate seen most recently becomes canonical (earliest date breaks
+    ties) and the rest link to it. Returns {eventHash: new canonicalHash}
+    """
+    groups = {}
+    for i in range(0, len(old_canonicals), PREFETCH_CHUNK):
+        for doc in events_col().find(
+            {"canonicalHash": {"$in": old_canonicals[i:i + PREFETCH_CHUNK]}, "status": {"$ne": "inactive"}},
+            {"_id": 0, "eventHash": 1, "canonicalHash": 1, "dateTime": 1, "lastSeenRun": 1}
+        ):
+            groups.setdefault(doc["canonicalHash"], []).append(doc)
+    
+    repointed = {}
+    for old, duplicates in groups.items():
+        duplicates.sort(key=lambda d: (-(d.get("lastSeenRun") or 0), to_utc_naive(d["dateTime"]), d["eventHash"]))
+        head = duplicates[0]["eventHash"]
+        repointed[head] = None
+        others = [d["eventHash"] for d in duplicates[1:]] + ([] if retired else [old])
+        if others:
+            events_col().update_many({"eventHash": {"$in": others}}, {"$set": {"canonicalHash": head}})
+            repointed.update(dict.fromkeys(others, head))
+    if groups:
+        events_col().update_many({"eventHash": {"$in": [h for h, c in repointed.items() if c is None]}},
+                                 {"$set": {"canonicalHash": None}})
+    if NEAR_DUPES_ENABLED and (repointed or retired and old_canonicals):
+        near_dupes.release(old_canonicals if retired else [], repointed)
+    return repointed
+
+def touch_unchanged(event_hashes, generation):
+    """Stamp the run generation (and lastScrapedAt) on events that needed no other write"""
+    fields = {"lastSeenRun": generation}
+    if TOUCH_UNCHANGED:
+        fields["lastScrapedAt"] = datetime.utcnow()
+    for i in range(0, len(event_hashes), PREFETCH_CHUNK):
+        events_col().update_many(
+            {"eventHash": {"$in": event_hashes[i:i + PREFETCH_CHUNK]}},
+            {"$set": fields}
+        )
+
+def sync_batches(batches, city="Sydney", source="Eventbrite", started_at=None, metrics=None):
+    """
+    Sync an iterable of event batches (e.g. listing pages as they arrive)
+    Each batch is written in WRITE_BATCH chunks as soon as it is produced, each
+    write overlapping the next fetch; the inactive sweep and scrape log run once
+    at the end. Returns statistics dictionary
+    """
+    metrics = metrics or RunMetrics(city, source)
+    started_at = started_at or metrics.started_at
+    stats = {"new": 0, "updated": 0, "unchanged": 0, "inactive": 0, "duplicates": 0, "enriched": 0,
+             "pagesChanged": 0, "fetched": 0, "detailFetches": 0}
+    generation = None
+    writer = BulkWriter(stats, metrics)
+    
+    try:
+        for batch in batches:
+            if not batch:
+                continue
+            if generation is None:
+                generation = next_run_generation()
+            sync_batch(batch, stats, generation, writer, metrics)
+    finally:
+        writer.close()
+    total_fetched = stats["fetched"]
     
-    # Mark events not seen in this scrape as inactive (only for non-imported events)
+    if not total_fetched:
+        logger.warning("⚠️ No events to sync")
+        return {"new": 0, "updated": 0, "unchanged": 0, "inactive": 0}
+    
+    if ENRICH_ENABLED:
+        detail_cache.save()
+    
+    # Mark events not stamped by this run as inactive (only for non-imported events)
     inactive_query = {
-        "eventHash": {"$nin": list(scraped_hashes)},
-        "status": {"$nin": ["inactive", "imported"]},
-        "dateTime": {"$lt": datetime.utcnow() - timedelta(hours=12)},  # Only mark past events
         "sourceName": source,
-        "city": city.title()
+        "city": city.title(),
+        "$or": [{"lastSeenRun": {"$lt": generation}}, {"lastSeenRun": None}],
+        "status": {"$nin": ["inactive", "imported"]},
+        "dateTime": {"$lt": datetime.utcnow() - timedelta(hours=12)}  # Only mark past events
     }
     
-    inactive_result = events_col.update_many(
-        inactive_query,
-        {
-            "$set": {
-                "status": "inactive",
-                "lastScrapedAt": datetime.utcnow()
+    with metrics.stage("inactive_sweep"):
+        inactivated = [doc["eventHash"] for doc in events_col().find(inactive_query, {"_id": 0, "eventHash": 1})]
+        inactive_result = events_col().update_many(
+            inactive_query,
+            {
+                "$set": {
+                    "status": "inactive",
+                    "lastScrapedAt": datetime.utcnow()
+                }
             }
-        }
-    )
-    stats["inactive"] = inactive_result.modified_count
+        )
+        stats["inactive"] = inactive_result.modified_count
+        
+        # Rescheduled / renamed listings get a new eventHash - retire the old version
+        superseded = [h for h in superseded_events(source, city, generation, writer.listing_keys) if h not in inactivated]
+        if superseded:
+            events_col().update_many(
+                {"eventHash": {"$in": superseded}},
+                {"$set": {"status": "inactive", "lastScrapedAt": datetime.utcnow()}}
+            )
+            inactivated += superseded
+            stats["inactive"] += len(superseded)
+        
+        repointed = promote_duplicates(inactivated)
+        # Prefer the listing seen this run as canonical over one that has dropped off
+        repointed.update(promote_duplicates(stale_canonicals(source, city, generation), retired=False))
+    if DELTAS_ENABLED:
+        writer.changes.extend((h, ["canonicalHash"]) for h in repointed)
+    if NEAR_DUPES_ENABLED:
+        near_dupes.save()
+    
+    delta_seq = None
+    if DELTAS_ENABLED:
+        with metrics.stage("delta_publish"):
+            delta_seq = publish_delta(city, source, generation, writer.changes, inactivated)
     
     # Log statistics
     logger.info("\n" + "="*70)
@@ -440,71 +1821,300 @@ def sync_to_mongo(events, city="Sydney", source="Eventbrite"):
     logger.info(f"  🔄 Updated events:   {stats['updated']}")
     logger.info(f"  ⚪ Unchanged events: {stats['unchanged']}")
     logger.info(f"  ⏸️  Inactivated:      {stats['inactive']}")
-    logger.info(f"  💾 Total in DB:      {events_col.count_documents({'sourceName': source, 'city': city.title()})}")
+    logger.info(f"  👯 Near-duplicates:  {stats['duplicates']}")
+    logger.info(f"  🔎 Enriched:         {stats['enriched']} ({stats['detailFetches']} detail pages fetched)")
+    logger.info(f"  💾 Total in DB:      {events_col().count_documents({'sourceName': source, 'city': city.title()})}")
     logger.info("="*70)
     
     # Create scrape log
     scrape_log = {
         "sourceName": source,
         "city": city.title(),
-        "totalFetched": len(events),
+        "totalFetched": total_fetched,
         "newEvents": stats["new"],
         "updatedEvents": stats["updated"],
         "inactiveEvents": stats["inactive"],
-        "startedAt": datetime.utcnow() - timedelta(seconds=30),  # Approximate
+        "enrichedEvents": stats["enriched"],
+        "detailPagesFetched": stats["detailFetches"],
+        "notModified": stats["pagesChanged"] == 0,
+        "runGeneration": generation,
+        "deltaSeq": delta_seq,
+        "startedAt": started_at,
         "finishedAt": datetime.utcnow(),
         "status": "success",
         "errorMessage": None
     }
-    scrape_logs_col.insert_one(scrape_log)
+    scrape_log.update(metrics.to_doc())
+    scrape_logs_col().insert_one(scrape_log)
     
     return stats
 
+_delta_lock = threading.Lock()
+
+def next_delta_seq():
+    """Monotonic sequence number for the delta feed (separate from run generations, which start earlier)"""
+    from pymongo import ReturnDocument
+    
+    counter = counters_col().find_one_and_update(
+        {"_id": "deltaSeq"},
+        {"$inc": {"seq": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter["seq"]
+
+def publish_delta(city, source, generation, changes, inactivated):
+    """
+    Append one run's changes to the deltas collection (and SCRAPER_DELTA_FILE)
+    Consumers poll for seq > the last one they applied. The sequence number is
+    allocated and the entry written under one lock, so concurrent city runs in this
+    process never expose seq N+1 before N; across processes (overlapping cron runs)
+    they can, and GET /api/events/changes waits out such gaps for a grace period.
+    Returns the seq, or None if nothing changed
+    """
+    fields_by_hash = {}
+    for event_hash, fields in changes:
+        if event_hash not in fields_by_hash or fields is None:
+            fields_by_hash[event_hash] = fields
+        elif fields_by_hash[event_hash] is not None:
+            merged = fields_by_hash[event_hash]
+            merged.extend(f for f in fields if f not in merged)
+    added = [h for h, fields in fields_by_hash.items() if fields is None]
+    updated = [{"eventHash": h, "fields": fields} for h, fields in fields_by_hash.items() if fields]
+    if not (added or updated or inactivated):
+        return None
+    
+    with _delta_lock:
+        delta = {
+            "seq": next_delta_seq(),
+            "runGeneration": generation,
+            "sourceName": source,
+            "city": city.title(),
+            "cityKey": city_key(city),
+            "createdAt": datetime.utcnow(),
+            "added": added,
+            "updated": updated,
+            "inactivated": inactivated
+        }
+        line = json.dumps({**delta, "createdAt": delta["createdAt"].isoformat()}, separators=(",", ":"))
+        deltas_col().insert_one(delta)
+        if DELTA_FILE:
+            try:
+                with open(DELTA_FILE, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                logger.warning(f"Could not append to delta file {DELTA_FILE}: {e}")
+    
+    logger.info(f"📣 Delta #{delta['seq']}: +{len(added)} ~{len(updated)} -{len(inactivated)}")
+    return delta["seq"]
+
+def log_failed_run(city, started_at, message, source="Eventbrite", metrics=None):
+    """Record a failed scrape in scrapeLogs"""
+    scrape_log = {
+        "sourceName": source,
+        "city": city.title(),
+        "totalFetched": 0,
+        "newEvents": 0,
+        "updatedEvents": 0,
+        "inactiveEvents": 0,
+        "startedAt": started_at,
+        "finishedAt": datetime.utcnow(),
+        "status": "failed",
+        "errorMessage": message
+    }
+    if metrics is not None:
+        scrape_log.update(metrics.to_doc())
+    scrape_logs_col().insert_one(scrape_log)
+
+def publish_run_metrics(metrics, status):
+    """Fold a finished run into the Prometheus registry and refresh SCRAPER_METRICS_FILE"""
+    metrics_registry.record(metrics, status)
+    if not METRICS_FILE:
+        return
+    try:
+        metrics_registry.write(METRICS_FILE)
+    except OSError as e:
+        logger.warning(f"Could not write metrics file {METRICS_FILE}: {e}")
+
+def log_stage_timings(metrics):
+    """One log line with where the run spent its time, slowest stage first"""
+    stages = sorted(metrics.stages.items(), key=lambda item: -item[1]["seconds"])
+    if stages:
+        logger.info("⏱️  " + ", ".join(f"{name} {s['seconds'] * 1000:.0f}ms/{s['count']}" for name, s in stages))
+
 def main(city="sydney", use_playwright=False):
     """Main scraping function with fallback logic"""
     logger.info("="*70)
     logger.info(f"EVENTBRITE SCRAPER - {city.title()} - {datetime.utcnow().isoformat()}")
     logger.info("="*70 + "\n")
     
-    start_time = time.time()
+    metrics = RunMetrics(city)
+    batches = None
     
-    # Try requests method first (faster)
+    # Try requests method first (faster); pages stream into the sync stage
     if not use_playwright:
-        events = scrape_with_requests(city)
+        batches = scrape_with_requests(city, metrics=metrics)
     
     # Fallback to Playwright if requests failed
-    if not events or use_playwright:
-        events = scrape_with_playwright(city, max_scrolls=8)
+    if not batches:
+        events = scrape_with_playwright(city, max_scrolls=8, metrics=metrics)
+        batches = [events] if events else None
     
-    if not events:
+    if not batches:
         logger.error("❌ Failed to scrape any events after all attempts")
-        # Create failure log
-        scrape_logs_col.insert_one({
-            "sourceName": "Eventbrite",
-            "city": city.title(),
-            "totalFetched": 0,
-            "newEvents": 0,
-            "updatedEvents": 0,
-            "inactiveEvents": 0,
-            "startedAt": datetime.utcnow() - timedelta(seconds=30),
-            "finishedAt": datetime.utcnow(),
-            "status": "failed",
-            "errorMessage": "No events scraped after all attempts"
-        })
+        log_failed_run(city, metrics.started_at, "No events scraped after all attempts", metrics=metrics)
+        publish_run_metrics(metrics, "failed")
         return False
     
     # Sync to MongoDB
-    stats = sync_to_mongo(events, city=city, source="Eventbrite")
+    try:
+        stats = sync_batches(batches, city=city, source="Eventbrite", metrics=metrics)
+    except Exception:
+        publish_run_metrics(metrics, "failed")
+        raise
+    publish_run_metrics(metrics, "success")
     
-    elapsed = time.time() - start_time
-    logger.info(f"\n✨ Scraping completed in {elapsed:.1f} seconds")
+    logger.info(f"\n✨ Scraping completed in {metrics.duration:.1f} seconds")
+    log_stage_timings(metrics)
     
     return stats["new"] + stats["updated"] > 0
 
+def main_multi(cities, use_playwright=False, max_workers=MAX_WORKERS):
+    """
+    Scrape several cities concurrently in one process
+    Shares the Mongo connection and per-host rate limiters across cities
+    """
+    check_source_url(cities)
+    logger.info(f"🌏 Multi-city run: {', '.join(c.title() for c in cities)} ({max_workers} workers)")
+    start_time = time.time()
+    results = {}
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(cities)))) as pool:
+        futures = {pool.submit(main, city, use_playwright): city for city in cities}
+        for future in as_completed(futures):
+            city = futures[future]
+            try:
+                results[city] = future.result()
+            except Exception as e:
+                logger.error(f"❌ {city.title()} failed: {e}")
+                log_failed_run(city, datetime.utcnow(), str(e))
+                results[city] = False
+    
+    elapsed = time.time() - start_time
+    logger.info(f"\n✨ Multi-city run completed in {elapsed:.1f} seconds")
+    for city, ok in results.items():
+        logger.info(f"  {'✅' if ok else '⚪'} {city.title()}")
+    
+    return any(results.values())
+
+# Daemon scheduling: busy cities refresh every MIN_INTERVAL, quiet ones back off to MAX_INTERVAL
+MIN_INTERVAL = float(os.getenv("SCRAPER_MIN_INTERVAL_MIN", "60")) * 60
+MAX_INTERVAL = float(os.getenv("SCRAPER_MAX_INTERVAL_MIN", "720")) * 60
+CHURN_FOR_MIN_INTERVAL = float(os.getenv("SCRAPER_CHURN_FULL", "0.2"))  # share of events changing per run
+SCHEDULE_HISTORY = int(os.getenv("SCRAPER_SCHEDULE_HISTORY", "5"))
+
+def next_interval(city, source="Eventbrite"):
+    """
+    Seconds until a city's next refresh, from its recent scrapeLogs
+    Interval shrinks linearly from MAX_INTERVAL to MIN_INTERVAL as the share of
+    new/updated events per run approaches CHURN_FOR_MIN_INTERVAL
+    """
+    logs = list(
+        scrape_logs_col().find(
+            {"sourceName": source, "city": city.title()},
+            {"_id": 0, "status": 1, "totalFetched": 1, "newEvents": 1, "updatedEvents": 1}
+        ).sort("finishedAt", -1).limit(SCHEDULE_HISTORY)
+    )
+    if not logs or logs[0].get("status") == "failed":
+        return MIN_INTERVAL
+    
+    fetched = sum(log.get("totalFetched") or 0 for log in logs)
+    changed = sum((log.get("newEvents") or 0) + (log.get("updatedEvents") or 0) for log in logs)
+    churn = changed / fetched if fetched else 0
+    return MAX_INTERVAL - (MAX_INTERVAL - MIN_INTERVAL) * min(1.0, churn / CHURN_FOR_MIN_INTERVAL)
+
+def run_daemon(cities, use_playwright=False, max_workers=MAX_WORKERS):
+    """
+    Long-running mode: keep Mongo, HTTP sessions and the browser warm and
+    refresh each city on its own adaptive interval until SIGINT/SIGTERM
+    """
+    check_source_url(cities)
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    
+    logger.info(f"🛰️ Daemon started for {', '.join(c.title() for c in cities)} ({max_workers} workers)")
+    metrics_server = None
+    if METRICS_PORT:
+        metrics_server = metrics_registry.serve(METRICS_PORT)
+        logger.info(f"📈 Metrics on http://127.0.0.1:{METRICS_PORT}/metrics")
+    due = {city: time.time() for city in cities}
+    running = {}
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(cities)))) as pool:
+        while not stop.is_set():
+            now = time.time()
+            for city, due_at in due.items():
+                if due_at <= now and city not in running:
+                    running[city] = (pool.submit(main, city, use_playwright), datetime.utcnow())
+            
+            for city, (future, started_at) in list(running.items()):
+                if not future.done():
+                    continue
+                del running[city]
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"❌ {city.title()} failed: {e}")
+                    log_failed_run(city, started_at, str(e))
+                interval = next_interval(city)
+                due[city] = time.time() + interval
+                logger.info(f"🗓️ Next {city.title()} refresh in {interval / 60:.0f} min")
+            
+            waits = [due[c] - time.time() for c in cities if c not in running]
+            stop.wait(timeout=max(1, min(waits + [5])))
+        
+        logger.info("🛑 Stopping daemon - waiting for running scrapes to finish")
+    
+    if metrics_server is not None:
+        metrics_server.shutdown()
+    return True
+
 if __name__ == "__main__":
-    # Get city from command line argument or environment variable
-    city = sys.argv[1] if len(sys.argv) > 1 else os.getenv("SCRAPER_CITY", "sydney")
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s | %(levelname)-8s | %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    
+    if "--setup-indexes" in sys.argv:
+        ensure_indexes(force=True)
+        sys.exit(0)
+    
+    # Cities from command line arguments or environment variable (comma separated)
+    cities = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not cities:
+        cities = [c.strip() for c in os.getenv("SCRAPER_CITY", "sydney").split(",") if c.strip()]
     force_playwright = "--playwright" in sys.argv
+    if "--no-cache" in sys.argv:
+        HTTP_CACHE_ENABLED = False
+    try:
+        check_source_url(cities)
+    except ValueError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(2)
     
-    success = main(city=city, use_playwright=force_playwright)
+    ensure_indexes()
+    
+    try:
+        if "--daemon" in sys.argv:
+            success = run_daemon(cities, use_playwright=force_playwright)
+        elif len(cities) > 1:
+            success = main_multi(cities, use_playwright=force_playwright)
+        else:
+            success = main(city=cities[0], use_playwright=force_playwright)
+    finally:
+        browser_pool.close()
+        parse_pool.close()
+        enricher.close()
     sys.exit(0 if success else 1)
\ No newline at end of file
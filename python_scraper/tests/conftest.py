@@ -0,0 +1,46 @@
+# conftest.py
+"""
+Shared setup for the scraper regression tests
+Runs fully offline: an in-memory Mongo stand-in, no detail-page fetches, and
+near-duplicate / delta state kept out of the scraper's own state files.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+import pytest
+
+os.environ["SCRAPER_ENRICH"] = "0"
+os.environ.pop("SCRAPER_DELTA_FILE", None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper  # noqa: E402
+from memory_mongo import MemoryClient  # noqa: E402
+from near_dupes import NearDuplicateIndex  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Fresh in-memory database and near-duplicate index for each test"""
+    database = MemoryClient()["test"]
+    scraper.use_database(database)
+    scraper.ensure_indexes()
+    monkeypatch.setattr(scraper, "near_dupes", NearDuplicateIndex(str(tmp_path / "near_dupes.json")))
+    yield database
+    scraper.use_database(None)
+
+
+def make_event(title, when, city="Sydney", url=None, venue="Town Hall", **fields):
+    """A scraped event as extraction would produce it"""
+    url = url or f"https://www.eventbrite.com.au/e/{'-'.join(title.lower().split())}"
+    event = scraper.EventRecord(
+        title=title, shortSummary="", description="An event", dateTime=when, endDateTime=None,
+        venueName=venue, venueAddress="", city=city, imageUrl="", sourceName="Eventbrite",
+        sourceUrl=url, sourceEventId=url.rsplit("-", 1)[-1], category=["General"], tags=[],
+        lastScrapedAt=datetime.utcnow(), eventHash=scraper.generate_event_hash(title, when, url),
+    )
+    for key, value in fields.items():
+        event[key] = value
+    return event
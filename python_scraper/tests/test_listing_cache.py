@@ -0,0 +1,94 @@
+# test_listing_cache.py
+"""Regression tests for the listing-page response cache and its interaction with sync"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import scraper
+from http_cache import ResponseCache
+from host_health import HostHealth
+
+URL = "https://www.eventbrite.com.au/d/australia--sydney/events/"
+
+
+def listing_html(n):
+    start = (datetime.utcnow() + timedelta(days=2)).replace(microsecond=0)
+    items = [{
+        "@type": "Event",
+        "name": f"Cached Event {i}",
+        "startDate": (start + timedelta(hours=i)).isoformat(),
+        "url": f"https://www.eventbrite.com.au/e/cached-event-{i}",
+        "identifier": 5000 + i,
+        "location": {"name": "Hall", "address": {"addressLocality": "Sydney"}},
+    } for i in range(n)]
+    return f'<html><body><script type="application/ld+json">{json.dumps(items)}</script></body></html>'
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.text = body
+        self.content = body.encode("utf-8")
+        self.status_code = status_code
+        self.headers = {"ETag": '"v1"'}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Serves one fixed page, answering 304 to a matching If-None-Match"""
+
+    def __init__(self, body):
+        self.body = body
+
+    def get(self, url, headers=None, **kwargs):
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return FakeResponse("", 304)
+        return FakeResponse(self.body)
+
+
+@pytest.fixture
+def cache(db, tmp_path, monkeypatch):
+    response_cache = ResponseCache(str(tmp_path / "http_cache"))
+    monkeypatch.setattr(scraper, "response_cache", response_cache)
+    monkeypatch.setattr(scraper, "HTTP_CACHE_ENABLED", True)
+    monkeypatch.setattr(scraper, "host_health", HostHealth(str(tmp_path / "host_health.json")))
+    monkeypatch.setattr(scraper, "HOST_RATE", 1000.0)
+    scraper._host_buckets.clear()
+    return response_cache
+
+
+def fetch(session):
+    return scraper.fetch_listing_page(session, URL, "sydney", max_retries=1)
+
+
+def test_page_is_cached_only_after_its_events_are_written(db, cache, monkeypatch):
+    session = FakeSession(listing_html(5))
+
+    def failing_bulk_write(*args, **kwargs):
+        raise RuntimeError("primary stepped down")
+
+    page = fetch(session)
+    assert isinstance(page, scraper.ListingPage) and len(page) == 5
+    with monkeypatch.context() as patch, pytest.raises(RuntimeError):
+        patch.setattr(db["events"], "bulk_write", failing_bulk_write)
+        scraper.sync_batches([page], city="Sydney")
+    assert cache.get(URL, scraper.LISTING_CACHE_VERSION) is None
+
+    # The failed page is parsed and written again rather than skipped as unchanged
+    page = fetch(session)
+    assert isinstance(page, scraper.ListingPage)
+    stats = scraper.sync_batches([page], city="Sydney")
+    assert (stats["new"], stats["unchanged"]) == (5, 0)
+    assert db["events"].count_documents({}) == 5
+
+    # Once written, a 304 is trusted
+    page = fetch(session)
+    assert isinstance(page, scraper.UnchangedPage) and len(page) == 5
+
+
+def test_cache_entries_from_another_version_are_misses(cache):
+    cache.store(cache.entry(URL, FakeResponse("x"), "old", eventHashes=["a"]))
+    assert cache.get(URL, scraper.LISTING_CACHE_VERSION) is None
@@ -0,0 +1,40 @@
+# test_parse_pool.py
+"""Regression tests for the parse pool's in-thread fallback and recovery"""
+
+import concurrent.futures
+
+import scraper
+from test_listing_cache import listing_html
+
+
+class FakeExecutor:
+    """Runs chunks inline; the first instance's workers all fail, as after a crash"""
+    created = []
+
+    def __init__(self, max_workers=None, mp_context=None):
+        self.broken = not FakeExecutor.created
+        FakeExecutor.created.append(self)
+
+    def submit(self, fn, *args):
+        future = concurrent.futures.Future()
+        if self.broken:
+            future.set_exception(concurrent.futures.process.BrokenProcessPool("worker died"))
+        else:
+            future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_pool_is_recreated_after_a_worker_failure(monkeypatch):
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", FakeExecutor)
+    monkeypatch.setattr(FakeExecutor, "created", [])
+    pool = scraper.ParsePool(workers=2, inline_bytes=0)
+    html = listing_html(3)
+
+    assert len(pool.extract(html, "Sydney")) == 3  # parsed in-thread after the failure
+    assert len(pool.extract(html, "Sydney")) == 3
+
+    assert pool.workers == 2
+    assert [executor.broken for executor in FakeExecutor.created] == [True, False]
@@ -0,0 +1,183 @@
+# test_sync.py
+"""Regression tests for sync classification, the inactive sweep, near-duplicates, the delta feed and index provisioning"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import scraper
+from conftest import make_event
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+
+def stored(db, event):
+    return db["events"].find_one({"eventHash": event["eventHash"]})
+
+
+# --- classify_event ---
+
+@pytest.mark.parametrize("existing, expected", [
+    (None, "new"),
+    ({"status": "new"}, "new"),
+    ({"status": "updated"}, "updated"),
+    ({"status": "inactive"}, "updated"),
+])
+def test_classify_event(existing, expected):
+    assert scraper.classify_event(make_event("Gig", NOW + timedelta(days=1)), existing) == expected
+
+
+def test_classify_imported_keeps_status_unless_critical_fields_change():
+    when = NOW + timedelta(days=1)
+    event = make_event("Gig", when)
+    assert scraper.classify_event(event, {"status": "imported", "title": "Gig", "dateTime": when + timedelta(minutes=30)}) == "imported"
+    assert scraper.classify_event(event, {"status": "imported", "title": "Old gig", "dateTime": when}) == "updated"
+    assert scraper.classify_event(event, {"status": "imported", "title": "Gig", "dateTime": when + timedelta(hours=2)}) == "updated"
+
+
+# --- sync ---
+
+def test_sync_counts_new_unchanged_and_updated(db):
+    events = [make_event(f"Concert {n}", NOW + timedelta(days=n + 1)) for n in range(3)]
+    stats = scraper.sync_to_mongo(events, city="Sydney")
+    assert (stats["new"], stats["updated"], stats["unchanged"]) == (3, 0, 0)
+
+    stats = scraper.sync_to_mongo(events, city="Sydney")
+    assert (stats["new"], stats["updated"], stats["unchanged"]) == (0, 0, 3)
+
+    events[0]["description"] = "Now with a support act"
+    stats = scraper.sync_to_mongo(events, city="Sydney")
+    assert (stats["new"], stats["updated"], stats["unchanged"]) == (0, 1, 2)
+    assert stored(db, events[0])["description"] == "Now with a support act"
+    assert stored(db, events[0])["cityKey"] == "sydney"
+
+
+def test_inactive_sweep_only_retires_unseen_past_non_imported_events(db):
+    seen = make_event("Still listed", NOW + timedelta(days=2))
+    unseen_future = make_event("Sold out", NOW + timedelta(days=2))
+    unseen_past = make_event("Finished", NOW - timedelta(days=1))
+    imported_past = make_event("Imported", NOW - timedelta(days=1))
+    other_city = make_event("Elsewhere", NOW - timedelta(days=1), city="Melbourne")
+    for event, status in ((unseen_future, "new"), (unseen_past, "new"), (imported_past, "imported"), (other_city, "new")):
+        db["events"].insert_one({**event.to_dict(), "status": status, "lastSeenRun": 0})
+
+    stats = scraper.sync_to_mongo([seen], city="Sydney")
+
+    assert stats["inactive"] == 1
+    assert stored(db, unseen_past)["status"] == "inactive"
+    assert stored(db, unseen_future)["status"] == "new"
+    assert stored(db, imported_past)["status"] == "imported"
+    assert stored(db, other_city)["status"] == "new"
+
+
+def test_rewrite_without_fresh_details_keeps_enriched_fields(db, tmp_path, monkeypatch):
+    details = {"description": "A much longer description from the detail page", "category": ["Music"], "tags": ["jazz"]}
+    monkeypatch.setattr(scraper, "ENRICH_ENABLED", True)
+    monkeypatch.setattr(scraper, "detail_cache", scraper.DetailCache(str(tmp_path / "detail_cache.json")))
+    monkeypatch.setattr(scraper, "fetch_event_details", lambda url, metrics=None: details)
+    when = NOW + timedelta(days=2)
+    scraper.sync_to_mongo([make_event("Jazz Night", when)], city="Sydney")
+
+    monkeypatch.setattr(scraper, "ENRICH_MAX_PER_RUN", 0)  # budget spent: the changed listing gets no details
+    event = make_event("Jazz Night", when, shortSummary="Now with a support act")
+    scraper.sync_to_mongo([event], city="Sydney")
+
+    doc = stored(db, event)
+    assert doc["shortSummary"] == "Now with a support act"
+    assert (doc["description"], doc["category"], doc["tags"]) == (details["description"], ["Music"], ["jazz"])
+
+
+# --- near-duplicates ---
+
+def test_near_duplicates_are_not_linked_across_cities(db):
+    when = NOW + timedelta(days=3)
+    sydney = make_event("Intro to Python Workshop", when, url="https://e/1", venue="Venue TBD")
+    melbourne = make_event("Intro to Python Workshop", when, city="Melbourne", url="https://e/2", venue="Venue TBD")
+    scraper.sync_to_mongo([sydney], city="Sydney")
+    scraper.sync_to_mongo([melbourne], city="Melbourne")
+    assert stored(db, melbourne)["canonicalHash"] is None
+
+
+def test_duplicates_are_promoted_when_their_canonical_goes_inactive(db):
+    canonical = make_event("Jazz Night at the Harbour", NOW - timedelta(hours=13), url="https://e/c")
+    first = make_event("Jazz Night at the Harbour!", NOW + timedelta(hours=2), url="https://e/a")
+    second = make_event("Jazz Night at the Harbour", NOW + timedelta(hours=3), url="https://e/b")
+    scraper.sync_to_mongo([canonical, first, second], city="Sydney")
+    assert stored(db, first)["canonicalHash"] == canonical["eventHash"]
+
+    scraper.sync_to_mongo([first, second], city="Sydney")  # canonical no longer listed and in the past
+
+    assert stored(db, canonical)["status"] == "inactive"
+    assert stored(db, first)["canonicalHash"] is None
+    assert stored(db, second)["canonicalHash"] == first["eventHash"]
+
+
+def test_rescheduled_listing_supersedes_its_old_version(db):
+    old = make_event("Jazz Night at the Harbour", NOW + timedelta(days=2), url="https://e/jazz-123")
+    moved = make_event("Jazz Night at the Harbour", NOW + timedelta(days=2, hours=2), url="https://e/jazz-123")
+    scraper.sync_to_mongo([old], city="Sydney")
+
+    stats = scraper.sync_to_mongo([moved], city="Sydney")
+
+    assert stored(db, moved)["canonicalHash"] is None
+    assert stored(db, old)["status"] == "inactive"
+    assert stats["inactive"] == 1
+
+
+def test_duplicate_seen_this_run_replaces_an_unlisted_canonical(db):
+    when = NOW + timedelta(days=2)
+    first = make_event("Jazz Night at the Harbour", when, url="https://e/a")
+    second = make_event("Jazz Night at the Harbour!", when, url="https://e/b")
+    scraper.sync_to_mongo([first, second], city="Sydney")
+    assert stored(db, second)["canonicalHash"] == first["eventHash"]
+
+    scraper.sync_to_mongo([second], city="Sydney")  # first dropped off the listing but is still upcoming
+
+    assert stored(db, second)["canonicalHash"] is None
+    assert stored(db, first)["canonicalHash"] == second["eventHash"]
+
+
+# --- delta feed ---
+
+def test_publish_delta_merges_repeated_events(db):
+    changes = [("a", None), ("a", ["title"]), ("b", ["title"]), ("b", ["dateTime", "title"]), ("c", [])]
+    seq = scraper.publish_delta("sydney", "Eventbrite", 7, changes, ["z"])
+    delta = scraper.deltas_col().find_one({"seq": seq})
+    assert delta["added"] == ["a"]
+    assert delta["updated"] == [{"eventHash": "b", "fields": ["title", "dateTime"]}]
+    assert delta["inactivated"] == ["z"]
+    assert (delta["city"], delta["cityKey"], delta["runGeneration"]) == ("Sydney", "sydney", 7)
+    assert scraper.publish_delta("sydney", "Eventbrite", 8, [("c", [])], []) is None
+    assert scraper.publish_delta("sydney", "Eventbrite", 9, [], ["y"]) == seq + 1
+
+
+def test_sync_runs_publish_deltas_with_changed_fields(db):
+    gig = make_event("Gig", NOW + timedelta(days=2))
+    talk = make_event("Talk", NOW + timedelta(days=3))
+    scraper.sync_to_mongo([gig, talk], city="Sydney")
+    scraper.sync_to_mongo([gig, talk], city="Sydney")  # nothing changed - no delta
+    assert [d["seq"] for d in db["deltas"].find()] == [1]
+
+    db["events"].insert_one({**make_event("Gone", NOW - timedelta(days=1)).to_dict(), "lastSeenRun": 0})
+    gig["venueName"] = "Opera House"
+    scraper.sync_to_mongo([gig, talk], city="Sydney")
+
+    first, second = sorted(db["deltas"].find(), key=lambda d: d["seq"])
+    assert sorted(first["added"]) == sorted([gig["eventHash"], talk["eventHash"]])
+    assert second["updated"] == [{"eventHash": gig["eventHash"], "fields": ["venueName"]}]
+    assert second["inactivated"] == [make_event("Gone", NOW - timedelta(days=1))["eventHash"]]
+    assert db["scrapeLogs"].find().sort("finishedAt", -1)[0]["deltaSeq"] == 2
+
+
+# --- indexes ---
+
+def test_new_index_version_backfills_search_fields(db):
+    db["events"].insert_one({"eventHash": "old", "title": "Jazz Night", "city": "Sydney", "venueName": "Town Hall"})
+    db["counters"].update_one({"_id": "eventIndexes"}, {"$set": {"version": scraper.INDEX_VERSION - 1}})
+
+    assert scraper.ensure_indexes()
+
+    doc = db["events"].find_one({"eventHash": "old"})
+    assert doc["cityKey"] == "sydney"
+    assert "jazz" in doc["searchTokens"]
+    assert not scraper.ensure_indexes()
@@ -0,0 +1,41 @@
+import mongoose from "mongoose";
+
+// One entry per scraper run that changed something (written by python_scraper, read-only here)
+const deltaSchema = new mongoose.Schema(
+  {
+    seq: {
+      type: Number,
+      unique: true,
+    },
+    runGeneration: Number,
+    sourceName: String,
+    city: String,
+    cityKey: String,
+
+    // eventHashes
+    added: {
+      type: [String],
+      default: [],
+    },
+    updated: [
+      {
+        _id: false,
+        eventHash: String,
+        fields: [String],
+      },
+    ],
+    inactivated: {
+      type: [String],
+      default: [],
+    },
+
+    createdAt: Date,
+  },
+  {
+    collection: "deltas",
+  }
+);
+
+deltaSchema.index({ cityKey: 1, seq: 1 });
+
+export default mongoose.model("Delta", deltaSchema);
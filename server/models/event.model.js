@@ -1,5 +1,6 @@
 import mongoose from "mongoose";
 import crypto from "crypto";
+import { buildSearchTokens, cityKey } from "../utils/searchTokens.js";
 
 const eventSchema = new mongoose.Schema(
   {
@@ -48,6 +49,10 @@ const eventSchema = new mongoose.Schema(
       default: "Sydney",
       index: true,
     },
+    // Normalized city (lowercase, accent-folded) for exact index lookups
+    cityKey: {
+      type: String,
+    },
 
     /* =========================
        CATEGORIZATION
@@ -61,6 +66,13 @@ const eventSchema = new mongoose.Schema(
       default: [],
     },
 
+    // Word prefixes from title/venue/summary (see utils/searchTokens.js)
+    searchTokens: {
+      type: [String],
+      default: [],
+      index: true,
+    },
+
     /* =========================
        MEDIA
     ========================= */
@@ -94,6 +106,24 @@ const eventSchema = new mongoose.Schema(
       unique: true,
       index: true,
     },
+    // Digest of scraped content; unchanged events are not rewritten
+    contentHash: {
+      type: String,
+    },
+    // eventHash of the canonical listing this one near-duplicates (null if canonical)
+    canonicalHash: {
+      type: String,
+      default: null,
+    },
+    // contentHash the detail-page enrichment (description, category, tags) was applied for
+    enrichedHash: {
+      type: String,
+    },
+    // Short per-field digests the scraper diffs to list changed fields in the delta feed
+    fieldHashes: {
+      type: mongoose.Schema.Types.Mixed,
+      default: undefined,
+    },
 
     /* =========================
        STATUS PIPELINE
@@ -108,6 +138,10 @@ const eventSchema = new mongoose.Schema(
       type: Date,
       default: Date.now,
     },
+    // Generation of the last scraper run that saw this event
+    lastSeenRun: {
+      type: Number,
+    },
 
     /* =========================
        DASHBOARD IMPORT INFO
@@ -149,6 +183,36 @@ eventSchema.pre("validate", function () {
 });
 
 
+/* ==================================================
+   🔎 SEARCH FIELDS (scraper writes these directly)
+================================================== */
+const TOKEN_FIELDS = ["title", "venueName", "shortSummary"];
+
+eventSchema.pre("validate", function () {
+  if (this.isNew || this.isModified("city")) this.cityKey = cityKey(this.city);
+  if (this.isNew || this.isModified(TOKEN_FIELDS)) {
+    this.searchTokens = buildSearchTokens(this);
+  }
+});
+
+// findByIdAndUpdate / findOneAndUpdate skip document hooks - recompute here
+eventSchema.pre("findOneAndUpdate", async function () {
+  const update = this.getUpdate() || {};
+  const changes = { ...update, ...(update.$set || {}) };
+  const touchesCity = "city" in changes;
+  const touchesTokens = TOKEN_FIELDS.some((field) => field in changes);
+  if (!touchesCity && !touchesTokens) return;
+
+  const fields = {};
+  if (touchesCity) fields.cityKey = cityKey(changes.city);
+  if (touchesTokens) {
+    const current = await this.model.findOne(this.getQuery(), TOKEN_FIELDS.join(" ")).lean();
+    fields.searchTokens = buildSearchTokens({ ...(current || {}), ...changes });
+  }
+  this.setUpdate({ ...update, $set: { ...(update.$set || {}), ...fields } });
+});
+
+
 /* ==================================================
    🔄 AUTO STATUS UPDATE ON CHANGE
 ================================================== */
@@ -166,5 +230,6 @@ eventSchema.pre("save", function () {
    🔗 COMPOUND INDEX FOR DASHBOARD FILTERS
 ================================================== */
 eventSchema.index({ city: 1, status: 1, dateTime: 1 });
+eventSchema.index({ cityKey: 1, status: 1, dateTime: 1 });
 
 export default mongoose.model("Event", eventSchema);
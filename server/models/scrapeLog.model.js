@@ -9,9 +9,23 @@ const scrapeLogSchema = new mongoose.Schema(
     newEvents: Number,
     updatedEvents: Number,
     inactiveEvents: Number,
+    enrichedEvents: Number,
+    detailPagesFetched: Number,
+    notModified: Boolean,
+    runGeneration: Number,
+    deltaSeq: Number,
 
     startedAt: Date,
     finishedAt: Date,
+    durationMs: Number,
+    bytesDownloaded: Number,
+    eventsExtracted: Number,
+
+    // Per-stage timings: { fetch: { count, totalMs, maxMs }, parse: {...}, bulk_write: {...}, ... }
+    timings: {
+      type: mongoose.Schema.Types.Mixed,
+      default: undefined
+    },
 
     status: {
       type: String,
@@ -1,6 +1,8 @@
 import express from "express";
 import Event from "../models/event.model.js";
+import Delta from "../models/delta.model.js";
 import { isAuthenticated } from "../middlewares/isAuthenticated.js";
+import { cityKey, queryTokens } from "../utils/searchTokens.js";
 
 const router = express.Router();
 
@@ -18,23 +20,18 @@ router.get("/", async (req, res) => {
     let query = {
       status: { $ne: "inactive" }, // exclude inactive
       dateTime: { $gte: today },   // today + future
+      canonicalHash: null,         // hide near-duplicate re-listings
     };
 
-    // ✅ City filter (case-insensitive, space-safe)
+    // ✅ City filter (case/accent-insensitive, index-backed via cityKey)
     if (city && city.trim() !== "") {
-      query.city = {
-        $regex: `^${city.trim()}$`,
-        $options: "i",
-      };
+      query.cityKey = cityKey(city);
     }
 
-    // ✅ Search filter
-    if (search && search.trim() !== "") {
-      query.$or = [
-        { title: { $regex: search.trim(), $options: "i" } },
-        { description: { $regex: search.trim(), $options: "i" } },
-        { venueName: { $regex: search.trim(), $options: "i" } },
-      ];
+    // ✅ Search filter (word prefixes precomputed by the scraper)
+    const tokens = queryTokens(search);
+    if (tokens.length) {
+      query.searchTokens = { $all: tokens };
     }
 
     const events = await Event.find(query)
@@ -162,15 +159,17 @@ router.get("/search", async (req, res) => {
     const { page = 1, limit = 20, search, city } = req.query;
     const skip = (page - 1) * limit;
 
-    let query = { status: { $ne: "inactive" }, dateTime: { $gte: new Date() } };
-    if (city) query.city = city;
+    let query = {
+      status: { $ne: "inactive" },
+      dateTime: { $gte: new Date() },
+      canonicalHash: null, // same listing rules as GET /
+    };
+    if (city) query.cityKey = cityKey(city);
+
+    const tokens = queryTokens(search);
+    if (tokens.length) query.searchTokens = { $all: tokens };
 
     const events = await Event.find(query)
-      .or(search ? [
-        { title: new RegExp(search, "i") },
-        { description: new RegExp(search, "i") },
-        { venueName: new RegExp(search, "i") }
-      ] : [])
       .sort({ dateTime: 1 })
       .skip(skip)
       .limit(parseInt(limit));
@@ -269,6 +268,52 @@ router.get("/stats/overview", isAuthenticated, async (req, res) => {
   }
 });
 
+/* ===============================
+   🔁 CHANGE FEED (scraper deltas)
+   GET /changes?since=N[&city=][&limit=]
+   Returns deltas with seq > N and the seq to poll from next;
+   reset=true means entries after N have expired - reload the full list
+================================ */
+// A seq is allocated just before its entry is written, so overlapping scraper
+// processes can commit N+1 before N: a gap is only skipped once it is this old
+const CHANGES_GAP_GRACE_MS = 60 * 1000;
+
+router.get("/changes", async (req, res) => {
+  try {
+    const since = Math.max(parseInt(req.query.since, 10) || 0, 0);
+    const limit = Math.min(Math.max(parseInt(req.query.limit, 10) || 100, 1), 500);
+
+    // Advance over all cities' seqs, stopping at the first gap still within the grace period
+    const pending = await Delta.find({ seq: { $gt: since } }, { _id: 0, seq: 1, createdAt: 1 })
+      .sort({ seq: 1 })
+      .limit(limit)
+      .lean();
+    let horizon = since;
+    for (const { seq, createdAt } of pending) {
+      if (seq !== horizon + 1 && Date.now() - new Date(createdAt).getTime() < CHANGES_GAP_GRACE_MS) break;
+      horizon = seq;
+    }
+
+    const query = { seq: { $gt: since, $lte: horizon } };
+    if (req.query.city) query.cityKey = cityKey(req.query.city);
+
+    const [deltas, oldest] = await Promise.all([
+      horizon > since
+        ? Delta.find(query, { _id: 0, __v: 0 }).sort({ seq: 1 }).lean()
+        : [],
+      Delta.findOne({}, { seq: 1 }).sort({ seq: 1 }).lean(),
+    ]);
+
+    res.json({
+      seq: horizon,
+      reset: Boolean(since && oldest && oldest.seq > since + 1),
+      deltas,
+    });
+  } catch {
+    res.status(500).json({ message: "Failed to fetch changes" });
+  }
+});
+
 // Add to events.route.js
 router.get("/:id", async (req, res) => {
   try {
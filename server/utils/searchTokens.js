@@ -0,0 +1,41 @@
+/* ==================================================
+   🔎 SEARCH TOKENS
+   Mirrors python_scraper/scraper.py (normalize_text, city_key,
+   build_search_tokens) so queries match what the scraper stores.
+================================================== */
+
+const MIN_TOKEN_PREFIX = 2;
+const MAX_TOKEN_PREFIX = 15;
+const MAX_SEARCH_TOKENS = 300;
+
+// Lowercase and strip accents ("Café" -> "cafe")
+export const normalizeText = (text = "") =>
+  (text || "").normalize("NFKD").replace(/\p{M}/gu, "").toLowerCase();
+
+export const cityKey = (city = "") =>
+  normalizeText(city).split(/\s+/).filter(Boolean).join(" ");
+
+const words = (text) => normalizeText(text).match(/[a-z0-9]+/g) || [];
+
+// Word prefixes stored on each event (title, venue, summary)
+export const buildSearchTokens = ({ title, venueName, shortSummary }) => {
+  const tokens = new Set();
+  const text = [title, venueName, shortSummary].filter(Boolean).join(" ");
+
+  for (const word of words(text)) {
+    for (let end = MIN_TOKEN_PREFIX; end <= Math.min(word.length, MAX_TOKEN_PREFIX); end++) {
+      tokens.add(word.slice(0, end));
+      if (tokens.size >= MAX_SEARCH_TOKENS) return [...tokens];
+    }
+  }
+  return [...tokens];
+};
+
+// Tokens for a user query; every one must be present ($all)
+export const queryTokens = (search = "") => [
+  ...new Set(
+    words(search)
+      .filter((w) => w.length >= MIN_TOKEN_PREFIX)
+      .map((w) => w.slice(0, MAX_TOKEN_PREFIX))
+  ),
+];